@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Compares the dashboard before and after a change. Each dashboard is measured
+# in its own fresh interpreter, so cold start includes every import the script
+# triggers and memory is not shared between the two runs.
+#
+#   python scripts/benchmark_dashboard.py --baseline OLD_DASHBOARD.py [--live]
+#
+# e.g. extract the previous version first:
+#   git show <rev>:src/dashboard.py > /tmp/dashboard_before.py
+#
+# Without --live, lightweight stand-ins for db_connection/mysql_connection serve
+# synthetic frames, so SQLAlchemy and the MySQL driver are not imported by
+# either version and the numbers exclude database round trips.
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+DASHBOARD = os.path.join(SRC_DIR, 'dashboard.py')
+PAGES = ['User Overview Analysis', 'User Engagement Analysis', 'Experience Analysis', 'Satisfaction Analysis']
+HEAVY_MODULES = ['pandas', 'matplotlib.pyplot', 'seaborn', 'sqlalchemy', 'mysql.connector']
+INTERACTIONS = 100
+
+
+# Register stand-in DB modules serving deterministic frames (runs in the child)
+def install_synthetic_sources(n_subscribers=100_000, seed=42):
+    import types
+
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    msisdns = 33_600_000_000 + np.arange(n_subscribers)
+
+    def fetch_data(query, params=None):
+        if 'COUNT(*) AS row_count' in query:
+            return pd.DataFrame({'row_count': [n_subscribers]})
+        if '"Handset Type"' in query:
+            return pd.DataFrame({'Handset Type': [f'Handset {i}' for i in range(10)], 'count': rng.integers(1_000, 10_000, 10)})
+        if 'session_count' in query:
+            return pd.DataFrame({'MSISDN/Number': msisdns, 'session_count': rng.integers(1, 20, n_subscribers),
+                                 'total_duration': rng.random(n_subscribers) * 1e6})
+        return pd.DataFrame({'MSISDN/Number': msisdns, 'avg_rtt_dl': rng.random(n_subscribers) * 200,
+                             'avg_throughput_dl': rng.random(n_subscribers) * 5e4})
+
+    def execute_mysql_query(query, values=None):
+        if 'COUNT(*) AS row_count' in query:
+            return pd.DataFrame({'row_count': [n_subscribers]})
+        return pd.DataFrame({'MSISDN': msisdns, 'engagement_score': rng.random(n_subscribers),
+                             'experience_score': rng.random(n_subscribers), 'satisfaction_score': rng.random(n_subscribers)})
+
+    def fetch_data_version(table='xdr_data'):
+        return f'{table}-{n_subscribers}-2019-04-30 00:00:00'
+
+    sys.modules['db_connection'] = types.SimpleNamespace(fetch_data=fetch_data, fetch_data_version=fetch_data_version)
+    sys.modules['mysql_connection'] = types.SimpleNamespace(execute_mysql_query=execute_mysql_query)
+
+
+def measure(dashboard, live):
+    process_start = time.perf_counter()
+    sys.path.insert(0, SRC_DIR)
+    from streamlit.testing.v1 import AppTest
+    import_seconds = time.perf_counter() - process_start
+
+    if not live:
+        # pandas is needed by the stand-ins; it is loaded by streamlit anyway
+        install_synthetic_sources()
+
+    app = AppTest.from_file(dashboard, default_timeout=300)
+    start = time.perf_counter()
+    app.run()
+    first_run_seconds = time.perf_counter() - start
+    if app.exception:
+        raise RuntimeError(app.exception)
+    loaded_after_first_run = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    latencies = []
+    for i in range(INTERACTIONS):
+        app.selectbox[0].select(PAGES[(i + 1) % len(PAGES)])
+        start = time.perf_counter()
+        app.run()
+        latencies.append(time.perf_counter() - start)
+    if app.exception:
+        raise RuntimeError(app.exception)
+
+    import gc
+    import psutil
+    gc.collect()
+    figures = len(__import__('matplotlib.pyplot').pyplot.get_fignums()) if 'matplotlib.pyplot' in sys.modules else 0
+    print(json.dumps({
+        'import_seconds': import_seconds,
+        'first_run_seconds': first_run_seconds,
+        'loaded_after_first_run': loaded_after_first_run,
+        'latencies': latencies,
+        'rss_mb': psutil.Process().memory_info().rss / 1e6,
+        'open_figures': figures,
+    }))
+
+
+def report(label, result):
+    import numpy as np
+
+    first_visits = np.asarray(result['latencies'][:len(PAGES)]) * 1e3
+    repeats = np.asarray(result['latencies'][len(PAGES):]) * 1e3
+    print(f"[{label}]")
+    print(f"  cold start: AppTest import {result['import_seconds'] * 1e3:.0f}ms + first script run "
+          f"{result['first_run_seconds'] * 1e3:.0f}ms; heavy modules loaded: {', '.join(result['loaded_after_first_run']) or 'none'}")
+    print(f"  first visit per page: mean {first_visits.mean():.0f}ms")
+    print(f"  repeat interactions: p50 {np.percentile(repeats, 50):.0f}ms, p99 {np.percentile(repeats, 99):.0f}ms")
+    print(f"  after {INTERACTIONS} interactions: RSS {result['rss_mb']:.0f}MB, open matplotlib figures {result['open_figures']}")
+
+
+if __name__ == "__main__":
+    live = '--live' in sys.argv
+    if sys.argv[1:2] == ['--measure']:
+        measure(sys.argv[2], live)
+        sys.exit(0)
+
+    targets = []
+    if '--baseline' in sys.argv:
+        targets.append(('before', os.path.abspath(sys.argv[sys.argv.index('--baseline') + 1])))
+    targets.append(('after', DASHBOARD))
+
+    for label, dashboard in targets:
+        command = [sys.executable, __file__, '--measure', dashboard] + (['--live'] if live else [])
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        report(label, json.loads(output.strip().splitlines()[-1]))
+
+    print("Note: AppTest.run() re-executes the whole script on every interaction; it does not "
+          "emulate fragment-only reruns, so 'after' latencies overstate what a browser session sees.")
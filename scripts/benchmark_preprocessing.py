@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Add the src directory to the Python path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from preprocessing import EXPERIENCE_METRICS, SCHEMAS, preprocess
+
+
+# Cleaning functions as they were before the shared preprocessing stage
+def legacy_clean_engagement_data(df):
+    return df.dropna(subset=["MSISDN/Number"]).copy()
+
+
+def legacy_clean_experience_data(df):
+    df.fillna(df.mean(numeric_only=True), inplace=True)
+    df['handset_type'].fillna(df['handset_type'].mode()[0], inplace=True)
+    return df
+
+
+def legacy_clean_satisfaction_data(df):
+    df.fillna(df.mean(numeric_only=True), inplace=True)
+    return df
+
+
+def synthetic_frame(columns, n_rows, missing=0.05, seed=42):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({'MSISDN/Number': 33_600_000_000 + np.arange(n_rows, dtype=np.float64)})
+    for column in columns:
+        values = rng.random(n_rows) * 1e6
+        values[rng.random(n_rows) < missing] = np.nan
+        frame[column] = values
+    frame.loc[rng.random(n_rows) < missing / 10, 'MSISDN/Number'] = np.nan
+    return frame
+
+
+def experience_frame(n_rows):
+    frame = synthetic_frame(EXPERIENCE_METRICS, n_rows)
+    handsets = np.array(['Apple iPhone 6S (A1688)', 'Samsung Galaxy S8 (Sm-G950F)', 'Huawei B528S-23A', None], dtype=object)
+    frame['handset_type'] = handsets[np.random.default_rng(7).integers(0, len(handsets), n_rows)]
+    return frame
+
+
+# Time and peak traced allocation of one call on a fresh frame
+def measure(clean, make_frame):
+    df = make_frame()
+    tracemalloc.start()
+    start = time.perf_counter()
+    clean(df)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    frame_mb = df.memory_usage(deep=True).sum() / 1e6
+    return elapsed, peak / 1e6, frame_mb
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    engagement_columns = ['session_count', 'total_duration', 'total_download', 'total_upload']
+    cases = [
+        ('engagement', legacy_clean_engagement_data, lambda df: preprocess(df, 'engagement'),
+         lambda: synthetic_frame(engagement_columns, n_rows)),
+        ('experience', legacy_clean_experience_data, lambda df: preprocess(df, 'experience'),
+         lambda: experience_frame(n_rows)),
+        ('experience (per handset)', None, lambda df: preprocess(df, 'experience', group_by='handset_type'),
+         lambda: experience_frame(n_rows)),
+        ('satisfaction', legacy_clean_satisfaction_data, lambda df: preprocess(df, 'satisfaction'),
+         lambda: synthetic_frame(SCHEMAS['satisfaction']['impute_mean'], n_rows)),
+    ]
+
+    print(f"{n_rows:,} rows, ~5% missing values per column")
+    for name, legacy, current, make_frame in cases:
+        elapsed, peak, frame_mb = measure(current, make_frame)
+        line = f"{name:<26} new: {elapsed * 1e3:7.1f}ms peak {peak:7.1f}MB"
+        if legacy is not None:
+            legacy_elapsed, legacy_peak, _ = measure(legacy, make_frame)
+            line += f" | old: {legacy_elapsed * 1e3:7.1f}ms peak {legacy_peak:7.1f}MB"
+        print(f"{line} | frame {frame_mb:.1f}MB")
@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.client import HTTPConnection
+
+import numpy as np
+import pandas as pd
+
+# Add the src directory to the Python path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from satisfaction_index import SatisfactionIndex, build_satisfaction_index, make_server
+
+
+def synthetic_scores(n_subscribers, seed=42):
+    rng = np.random.default_rng(seed)
+    msisdns = rng.choice(np.arange(33_600_000_000, 33_800_000_000), size=n_subscribers, replace=False)
+    return pd.DataFrame({
+        'MSISDN/Number': msisdns.astype(np.float64),
+        'engagement_score': rng.random(n_subscribers),
+        'experience_score': rng.random(n_subscribers),
+        'satisfaction_score': rng.random(n_subscribers),
+    })
+
+
+def percentiles_us(samples):
+    p50, p99 = np.percentile(np.asarray(samples) * 1e6, [50, 99])
+    return f"p50={p50:.1f}us p99={p99:.1f}us"
+
+
+def benchmark_api(index, keys, n_single=10_000, batch_size=1_000):
+    single = []
+    for key in keys[:n_single]:
+        start = time.perf_counter()
+        index.lookup(key)
+        single.append(time.perf_counter() - start)
+    print(f"Python API single lookup: {percentiles_us(single)}, {len(single) / sum(single):,.0f} lookups/s")
+
+    batches = [keys[i:i + batch_size] for i in range(0, len(keys) - batch_size + 1, batch_size)]
+    start = time.perf_counter()
+    for batch in batches:
+        index.lookup_many(batch)
+    elapsed = time.perf_counter() - start
+    print(f"Python API batch of {batch_size}: {elapsed / len(batches) * 1e3:.2f}ms per batch, "
+          f"{len(batches) * batch_size / elapsed:,.0f} lookups/s")
+
+
+def benchmark_http(index_dir, keys, n_single=2_000, batch_size=1_000):
+    server = make_server(index_dir, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    connection = HTTPConnection('127.0.0.1', server.server_address[1])
+    try:
+        single = []
+        for key in keys[:n_single]:
+            start = time.perf_counter()
+            connection.request('GET', f'/score?msisdn={key}')
+            connection.getresponse().read()
+            single.append(time.perf_counter() - start)
+        print(f"HTTP single lookup: {percentiles_us(single)}, {len(single) / sum(single):,.0f} lookups/s")
+
+        body = json.dumps({'msisdns': [int(k) for k in keys[:batch_size]]})
+        batch = []
+        for _ in range(50):
+            start = time.perf_counter()
+            connection.request('POST', '/scores', body=body, headers={'Content-Type': 'application/json'})
+            connection.getresponse().read()
+            batch.append(time.perf_counter() - start)
+        print(f"HTTP batch of {batch_size}: {percentiles_us(batch)}, "
+              f"{batch_size * len(batch) / sum(batch):,.0f} lookups/s")
+    finally:
+        connection.close()
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    n_subscribers = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    scores = synthetic_scores(n_subscribers)
+    rng = np.random.default_rng(0)
+    keys = rng.choice(scores['MSISDN/Number'].to_numpy(dtype=np.int64), size=100_000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = os.path.join(tmp, 'satisfaction_index')
+        start = time.perf_counter()
+        build_satisfaction_index(scores, index_dir)
+        print(f"Built index over {n_subscribers:,} subscribers in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        index = SatisfactionIndex(index_dir)
+        print(f"Opened memory-mapped index in {(time.perf_counter() - start) * 1e3:.2f}ms")
+
+        benchmark_api(index, keys)
+        benchmark_http(index_dir, keys)
@@ -0,0 +1,61 @@
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add the src directory to the Python path for imports
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from xdr_ingest import RAW_COLUMNS, HANDSET, MSISDN, ingest_xdr
+
+
+def write_synthetic_xdr(path, n_rows, n_subscribers, seed=42):
+    rng = np.random.default_rng(seed)
+    handsets = np.array(['Apple iPhone 6S (A1688)', 'Samsung Galaxy S8 (Sm-G950F)', 'Huawei B528S-23A', None], dtype=object)
+    chunk = 1_000_000
+    for start in range(0, n_rows, chunk):
+        size = min(chunk, n_rows - start)
+        frame = pd.DataFrame({column: rng.random(size) * 1e6 for column in RAW_COLUMNS[2:]})
+        frame.insert(0, HANDSET, handsets[rng.integers(0, len(handsets), size)])
+        frame.insert(0, MSISDN, (33_600_000_000 + rng.integers(0, n_subscribers, size)).astype(np.float64))
+        frame.to_csv(path, mode='a', header=start == 0, index=False)
+
+
+# One measurement per fresh interpreter, so RUSAGE_CHILDREN only covers this run's pool
+def run_once(path, n_workers):
+    start = time.perf_counter()
+    ingest_xdr([path], n_workers=n_workers, block_size=16 * 1024 * 1024)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux: largest single pool worker, and the coordinating process
+    worker_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    parent_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{elapsed} {worker_mb} {parent_mb}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--run']:
+        run_once(sys.argv[2], int(sys.argv[3]))
+        sys.exit(0)
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'xdr.csv')
+        write_synthetic_xdr(path, n_rows, n_subscribers=max(n_rows // 3, 1))
+        print(f"Synthetic xDR: {n_rows:,} rows, {os.path.getsize(path) / 1e6:.0f} MB")
+
+        baseline = None
+        for n_workers in worker_counts:
+            output = subprocess.run([sys.executable, __file__, '--run', path, str(n_workers)],
+                                    check=True, capture_output=True, text=True).stdout
+            elapsed, worker_mb, parent_mb = map(float, output.strip().splitlines()[-1].split())
+            baseline = baseline or elapsed
+            print(f"workers={n_workers}: {elapsed:.2f}s, {n_rows / elapsed:,.0f} rows/s, "
+                  f"speedup {baseline / elapsed:.2f}x, peak worker RSS {worker_mb:.0f} MB, "
+                  f"coordinator RSS {parent_mb:.0f} MB")
@@ -1,9 +1,12 @@
+import io
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from mysql_connection import execute_mysql_query
-from db_connection import fetch_data
+
+# Streamlit re-executes this script on every interaction, so module scope only
+# holds cheap work. pandas/matplotlib/seaborn and the DB drivers are imported
+# inside the functions that need them, rendered figures are cached as PNG
+# bytes per page and data version (and the matplotlib figure closed right after
+# rendering), and each page is a fragment so switching pages reruns only the
+# page area instead of the whole app.
 
 # Set Streamlit Page Config
 st.set_page_config(
@@ -13,8 +16,7 @@ st.set_page_config(
 )
 
 # Custom CSS for Professional Styling
-st.markdown(
-    """
+CUSTOM_CSS = """
     <style>
         .main {
             background-color: #4E5180;
@@ -45,17 +47,8 @@ st.markdown(
             border: 1px solid #d1d5db;  /* Light border for better definition */
         }
     </style>
-    """,
-    unsafe_allow_html=True
-)
-
-# Load Data from MySQL or PostgreSQL
-@st.cache_data
-def load_data(query, source='mysql'):
-    if source == 'mysql':
-        return execute_mysql_query(query)
-    else:
-        return fetch_data(query)
+    """
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # SQL Queries
 QUERY_OVERVIEW = "SELECT \"Handset Type\", COUNT(*) AS count FROM xdr_data GROUP BY \"Handset Type\" ORDER BY count DESC LIMIT 10;"
@@ -63,71 +56,115 @@ QUERY_ENGAGEMENT = "SELECT \"MSISDN/Number\", COUNT(*) AS session_count, SUM(\"D
 QUERY_EXPERIENCE = "SELECT \"MSISDN/Number\", AVG(\"Avg RTT DL (ms)\") AS avg_rtt_dl, AVG(\"Avg Bearer TP DL (kbps)\") AS avg_throughput_dl FROM xdr_data GROUP BY \"MSISDN/Number\";"
 QUERY_SATISFACTION = "SELECT * FROM user_satisfaction;"
 
+# Cheap per-source fingerprints; cached figures are keyed on them. xdr_data uses
+# db_connection.fetch_data_version, the signal the feature store is keyed on
+QUERY_MYSQL_VERSION = "SELECT COUNT(*) AS row_count FROM user_satisfaction;"
+VERSION_TTL_SECONDS = 60
+
+
+def _run_query(query, source):
+    if source == 'mysql':
+        from mysql_connection import execute_mysql_query
+        return execute_mysql_query(query)
+    from db_connection import fetch_data
+    return fetch_data(query)
+
+
+@st.cache_data(ttl=VERSION_TTL_SECONDS, show_spinner=False)
+def source_version(source):
+    if source == 'postgres':
+        from db_connection import fetch_data_version
+        return fetch_data_version()
+    result = _run_query(QUERY_MYSQL_VERSION, source)
+    return f"user_satisfaction-{int(result.iloc[0, 0]) if not result.empty else 0}"
+
+
+# Load Data from MySQL or PostgreSQL
+# Not cached: only render_page_figure calls it, on a cache miss, and keeping
+# every version's full result set would grow memory for the process lifetime
+def load_data(query, source='mysql'):
+    return _run_query(query, source)
+
+
 # Visualization Functions
-def plot_overview(df):
-    plt.figure(figsize=(12, 6))
-    sns.barplot(x='Handset Type', y='count', data=df, palette='viridis')
-    plt.title('Top 10 Handsets')
-    plt.xticks(rotation=45)
-    st.pyplot(plt)
-
-
-def plot_engagement(df):
-    plt.figure(figsize=(12, 6))
-    sns.histplot(df['session_count'], bins=30, kde=True, color='#60a5fa')
-    plt.title('User Engagement Distribution')
-    plt.xlabel('Session Count')
-    plt.ylabel('Frequency')
-    st.pyplot(plt)
-
-
-def plot_experience(df):
-    plt.figure(figsize=(12, 6))
-    sns.scatterplot(x='avg_throughput_dl', y='avg_rtt_dl', data=df, hue='avg_throughput_dl', palette='coolwarm', size='avg_throughput_dl')
-    plt.title('User Experience Analysis')
-    plt.xlabel('Avg Throughput DL (kbps)')
-    plt.ylabel('Avg RTT DL (ms)')
-    st.pyplot(plt)
-
-
-def plot_satisfaction(df):
-    plt.figure(figsize=(12, 6))
-    sns.histplot(df['satisfaction_score'], bins=30, kde=True, color='#10b981')
-    plt.title('User Satisfaction Distribution')
-    plt.xlabel('Satisfaction Score')
-    plt.ylabel('Frequency')
-    st.pyplot(plt)
+def plot_overview(df, ax):
+    import seaborn as sns
+    sns.barplot(x='Handset Type', y='count', data=df, palette='viridis', ax=ax)
+    ax.set_title('Top 10 Handsets')
+    ax.tick_params(axis='x', labelrotation=45)
+
+
+def plot_engagement(df, ax):
+    import seaborn as sns
+    sns.histplot(df['session_count'], bins=30, kde=True, color='#60a5fa', ax=ax)
+    ax.set_title('User Engagement Distribution')
+    ax.set_xlabel('Session Count')
+    ax.set_ylabel('Frequency')
+
+
+def plot_experience(df, ax):
+    import seaborn as sns
+    sns.scatterplot(x='avg_throughput_dl', y='avg_rtt_dl', data=df, hue='avg_throughput_dl', palette='coolwarm', size='avg_throughput_dl', ax=ax)
+    ax.set_title('User Experience Analysis')
+    ax.set_xlabel('Avg Throughput DL (kbps)')
+    ax.set_ylabel('Avg RTT DL (ms)')
+
+
+def plot_satisfaction(df, ax):
+    import seaborn as sns
+    sns.histplot(df['satisfaction_score'], bins=30, kde=True, color='#10b981', ax=ax)
+    ax.set_title('User Satisfaction Distribution')
+    ax.set_xlabel('Satisfaction Score')
+    ax.set_ylabel('Frequency')
+
+
+# Page -> (header, query, source, plot function)
+PAGES = {
+    'User Overview Analysis': ('📱 User Overview Analysis', QUERY_OVERVIEW, 'postgres', plot_overview),
+    'User Engagement Analysis': ('👥 User Engagement Analysis', QUERY_ENGAGEMENT, 'postgres', plot_engagement),
+    'Experience Analysis': ('⚙️ Experience Analysis', QUERY_EXPERIENCE, 'postgres', plot_experience),
+    'Satisfaction Analysis': ('😊 Satisfaction Analysis', QUERY_SATISFACTION, 'mysql', plot_satisfaction),
+}
+
+
+# Render a page's figure once per data version and keep only the PNG bytes
+@st.cache_data(show_spinner=False, max_entries=len(PAGES) * 2)
+def render_page_figure(page, version):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    _, query, source, plot = PAGES[page]
+    data = load_data(query, source=source)
+    fig, ax = plt.subplots(figsize=(12, 6))
+    try:
+        plot(data, ax)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', bbox_inches='tight')
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def render_page(page):
+    header, _, source, _ = PAGES[page]
+    st.header(header)
+    st.image(render_page_figure(page, source_version(source)), use_container_width=True)
+
+
+# Page selection and content live in one fragment, so switching pages reruns
+# only this block; the title, CSS and footer are not re-executed
+@st.fragment
+def analysis_view():
+    page = st.selectbox('📂 Select Analysis Page', tuple(PAGES))
+    render_page(page)
+
 
 # Streamlit App Layout
 st.title('📊 Telecom Data Analysis Dashboard')
 st.markdown("### Gain insights into user engagement, experience, and satisfaction with interactive visualizations.")
 
-# Sidebar Navigation
-page = st.sidebar.selectbox(
-    '📂 Select Analysis Page',
-    ('User Overview Analysis', 'User Engagement Analysis', 'Experience Analysis', 'Satisfaction Analysis')
-)
-
-# Page Routing
-if page == 'User Overview Analysis':
-    st.header('📱 User Overview Analysis')
-    data = load_data(QUERY_OVERVIEW, source='postgres')
-    plot_overview(data)
-
-elif page == 'User Engagement Analysis':
-    st.header('👥 User Engagement Analysis')
-    data = load_data(QUERY_ENGAGEMENT, source='postgres')
-    plot_engagement(data)
-
-elif page == 'Experience Analysis':
-    st.header('⚙️ Experience Analysis')
-    data = load_data(QUERY_EXPERIENCE, source='postgres')
-    plot_experience(data)
-
-elif page == 'Satisfaction Analysis':
-    st.header('😊 Satisfaction Analysis')
-    data = load_data(QUERY_SATISFACTION, source='mysql')
-    plot_satisfaction(data)
+analysis_view()
 
 # Footer
 st.markdown("---")
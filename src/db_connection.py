@@ -12,7 +12,13 @@ def connect_db():
     return engine
 
 # Fetch data from database
-def fetch_data(query):
+def fetch_data(query, params=None):
     engine = connect_db()
     with engine.connect() as connection:
-        return pd.read_sql(query, connection)
+        return pd.read_sql(query, connection, params=params)
+
+# Cheap fingerprint of a source table: changes when rows are appended or removed.
+# In-place updates that keep the row count and latest start time are not detected.
+def fetch_data_version(table='xdr_data'):
+    version = fetch_data(f'SELECT COUNT(*) AS row_count, MAX("Start") AS latest_start FROM {table}')
+    return f"{table}-{version.at[0, 'row_count']}-{version.at[0, 'latest_start']}"
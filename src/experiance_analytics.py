@@ -1,8 +1,9 @@
-from db_connection import fetch_data
+from db_connection import fetch_data, fetch_data_version
+from feature_store import materialize_features
+from preprocessing import preprocess
 import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.cluster import KMeans
-from sklearn.preprocessing import MinMaxScaler
 from yellowbrick.cluster import KElbowVisualizer
 
 # SQL Query to Aggregate User Experience Metrics
@@ -24,9 +25,10 @@ def load_experience_data():
     return fetch_data(QUERY_EXPERIENCE)
 
 # Data Cleaning (Task 3.1)
-def clean_experience_data(df):
-    df.fillna(df.mean(numeric_only=True), inplace=True)
-    df['handset_type'].fillna(df['handset_type'].mode()[0], inplace=True)
+# by_handset imputes each metric with its handset's mean instead of the global one;
+# precomputed stats must match, e.g. imputation_stats_from_db(QUERY_EXPERIENCE, 'experience', group_by='handset_type')
+def clean_experience_data(df, by_handset=False, stats=None):
+    df = preprocess(df, 'experience', stats=stats, group_by='handset_type' if by_handset else None)
     print(f"\nData after cleaning: {len(df)} rows remaining")
     return df
 
@@ -60,11 +62,11 @@ def analyze_tcp_by_handset(df):
     plt.show()
     print(tcp_view)
 
-# Normalize Data for Clustering (Task 3.4)
-def normalize_data(df):
-    scaler = MinMaxScaler()
-    scaled_features = scaler.fit_transform(df[['avg_rtt_dl', 'avg_throughput_dl', 'tcp_dl_retrans']])
-    return scaled_features
+# Normalize Data for Clustering (Task 3.4, stored memory-mapped, reused while the data is unchanged)
+def normalize_data(df, version=None):
+    # One row per (subscriber, handset), so the MSISDN alone does not identify a row
+    return materialize_features(df, ['avg_rtt_dl', 'avg_throughput_dl', 'tcp_dl_retrans'], 'experience', version=version,
+                                key_columns=['MSISDN/Number', 'handset_type'])
 
 # Perform K-means Clustering (Task 3.4)
 def perform_clustering(df, scaled_data, k=3):
@@ -84,6 +86,7 @@ def visualize_clusters(df):
 
 if __name__ == "__main__":
     # Load Data
+    data_version = fetch_data_version()
     experience_data = load_experience_data()
 
     # Clean Data (Task 3.1)
@@ -99,7 +102,7 @@ if __name__ == "__main__":
     analyze_tcp_by_handset(experience_data_cleaned)
 
     # Normalize Data
-    normalized_data = normalize_data(experience_data_cleaned)
+    normalized_data = normalize_data(experience_data_cleaned, version=data_version)
 
     # Perform Clustering (Task 3.4)
     clustered_data = perform_clustering(experience_data_cleaned, normalized_data)
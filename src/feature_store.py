@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+from versioned_store import current_path, new_version_dir, publish
+
+# On-disk store for scaled feature matrices.
+#
+# Each entry is published through versioned_store as a directory holding the
+# MinMax-scaled matrix as a .npy file, the row-aligned MSISDN array and a
+# meta.json with the column list, scaler parameters and the upstream data
+# version. Worker processes attach with np.load(mmap_mode='r'), so they share
+# the OS page cache instead of receiving a pickled copy of the matrix; only the
+# version directory path has to be sent to them.
+#
+# An entry is reused only for the same data version, column list and cleaning
+# (the schema and group_by preprocess records in df.attrs). The queries have no
+# deterministic row order, so each version also stores a per-row key hash: rows
+# returned in a different order are gathered into the caller's order (an
+# in-memory copy), and an entry whose rows cannot be matched one to one is
+# rebuilt.
+
+DEFAULT_STORE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../data/processed/feature_store'))
+WRITE_CHUNK_ROWS = 100_000
+
+
+# Fallback fingerprint when the caller has no upstream version: hashes every
+# row (order-sensitive, since rows map to matrix positions), which costs about
+# as much as the scaling it may skip. Prefer passing db_connection.fetch_data_version().
+def data_version(df, columns, msisdn_column='MSISDN/Number'):
+    hashed = pd.util.hash_pandas_object(df[[msisdn_column, *columns]], index=False)
+    return f'{len(df)}-{hashlib.sha1(hashed.to_numpy().tobytes()).hexdigest()[:16]}'
+
+
+# Per-row identity of a frame (uint64), used to match stored rows to incoming ones
+def row_keys(df, key_columns):
+    return pd.util.hash_pandas_object(df[key_columns], index=False).to_numpy()
+
+
+def entry_path(name, store_dir=DEFAULT_STORE_DIR):
+    return os.path.join(store_dir, name)
+
+
+# Directory of the currently published version of an entry, or None
+def current_entry(name, store_dir=DEFAULT_STORE_DIR):
+    return current_path(entry_path(name, store_dir))
+
+
+def read_meta(path):
+    meta_path = os.path.join(path, 'meta.json') if path else None
+    if meta_path is None or not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as handle:
+        return json.load(handle)
+
+
+# Attach to a stored matrix without copying it (safe to call in worker processes)
+def attach_features(path):
+    return np.load(os.path.join(path, 'features.npy'), mmap_mode='r')
+
+
+def attach_msisdns(path):
+    return np.load(os.path.join(path, 'msisdn.npy'), mmap_mode='r')
+
+
+# Stored matrix in the row order given by `keys`, or None if the rows differ
+def _align_rows(path, keys):
+    keys_path = os.path.join(path, 'row_keys.npy')
+    if not os.path.exists(keys_path):
+        return None  # written before row keys were stored
+    stored_keys = np.load(keys_path)
+    if np.array_equal(stored_keys, keys):
+        return attach_features(path)
+    order = np.argsort(stored_keys, kind='stable')
+    sorted_keys = stored_keys[order]
+    if (sorted_keys[1:] == sorted_keys[:-1]).any():
+        return None  # duplicate keys: positions are ambiguous
+    positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    if not np.array_equal(sorted_keys[positions], keys):
+        return None
+    return attach_features(path)[order[positions]]
+
+
+# Rebuild the fitted scaler from stored metadata
+def load_scaler(meta):
+    scaler = MinMaxScaler()
+    scaler.data_min_ = np.asarray(meta['scaler']['data_min'])
+    scaler.data_max_ = np.asarray(meta['scaler']['data_max'])
+    scaler.data_range_ = scaler.data_max_ - scaler.data_min_
+    scaler.scale_ = np.asarray(meta['scaler']['scale'])
+    scaler.min_ = np.asarray(meta['scaler']['min'])
+    scaler.n_features_in_ = len(meta['columns'])
+    scaler.n_samples_seen_ = meta['n_rows']
+    return scaler
+
+
+# Scale features once and store them, or reuse the stored matrix. key_columns
+# identify a row (default: the MSISDN); pass more when the MSISDN repeats.
+def materialize_features(df, columns, name, version=None, store_dir=DEFAULT_STORE_DIR, msisdn_column='MSISDN/Number',
+                         key_columns=None):
+    columns = list(columns)
+    version = version or data_version(df, columns, msisdn_column)
+    preprocessing = df.attrs.get('preprocessing')
+    keys = row_keys(df, list(key_columns or [msisdn_column]))
+    root = entry_path(name, store_dir)
+
+    current = current_entry(name, store_dir)
+    meta = read_meta(current)
+    if meta is not None and meta['version'] == version and meta['columns'] == columns \
+            and meta['n_rows'] == len(df) and meta.get('preprocessing') == preprocessing:
+        features = _align_rows(current, keys)
+        if features is not None:
+            print(f"Reusing stored feature matrix '{name}' ({meta['n_rows']} rows, version {version})")
+            return features
+
+    scaler = MinMaxScaler().fit(df[columns])
+
+    os.makedirs(root, exist_ok=True)
+    version_path = new_version_dir(root)
+    features = np.lib.format.open_memmap(os.path.join(version_path, 'features.npy'), mode='w+',
+                                         dtype=np.float64, shape=(len(df), len(columns)))
+    for start in range(0, len(df), WRITE_CHUNK_ROWS):
+        features[start:start + WRITE_CHUNK_ROWS] = scaler.transform(df.iloc[start:start + WRITE_CHUNK_ROWS][columns])
+    features.flush()
+    del features
+
+    np.save(os.path.join(version_path, 'msisdn.npy'), df[msisdn_column].to_numpy(dtype=np.float64))
+    np.save(os.path.join(version_path, 'row_keys.npy'), keys)
+    with open(os.path.join(version_path, 'meta.json'), 'w') as handle:
+        json.dump({
+            'name': name,
+            'version': version,
+            'preprocessing': preprocessing,
+            'columns': columns,
+            'n_rows': len(df),
+            'scaler': {
+                'data_min': scaler.data_min_.tolist(),
+                'data_max': scaler.data_max_.tolist(),
+                'scale': scaler.scale_.tolist(),
+                'min': scaler.min_.tolist(),
+            },
+        }, handle, indent=2)
+
+    publish(root, version_path)
+    print(f"Stored feature matrix '{name}' ({len(df)} rows, version {version}) at {version_path}")
+    return attach_features(version_path)
@@ -0,0 +1,261 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from db_connection import fetch_data
+
+# Time-windowed network KPI rollups per handset.
+#
+# Sessions are bucketed into hourly windows by their "End" timestamp ("Start"
+# when End is missing) and, per (window, handset, metric), reduced to
+# count/sum/min/max plus a log-bucketed
+# quantile sketch (DDSketch-style, ~1% relative error). Every part merges by
+# plain sums/mins/maxes, so:
+#   - daily windows are built from hourly ones without touching raw sessions,
+#   - each refresh only re-aggregates sessions from the last open hour onwards,
+#   - range queries merge stored windows instead of rescanning xdr_data.
+#
+# The xDR KPIs are per-session averages/volumes, so a session spanning several
+# hours cannot be split by overlap meaningfully; it is credited to the hour it
+# ended in. A session's KPIs are final only once it ends, so attributing by End
+# also means windows before the watermark hour never receive late sessions.
+#
+# Rollups live as long-format Parquet tables: <granularity>_summary.parquet and
+# <granularity>_sketch.parquet, with the ingest watermark in meta.json.
+
+DEFAULT_ROLLUP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../data/processed/kpi_rollups'))
+
+START = "Start"
+END = "End"
+HANDSET = "Handset Type"
+
+# Raw xDR column -> metric name
+METRICS = {
+    "Avg RTT DL (ms)": "rtt_dl",
+    "Avg RTT UL (ms)": "rtt_ul",
+    "Avg Bearer TP DL (kbps)": "throughput_dl",
+    "Avg Bearer TP UL (kbps)": "throughput_ul",
+    "TCP DL Retrans. Vol (Bytes)": "tcp_dl_retrans",
+    "TCP UL Retrans. Vol (Bytes)": "tcp_ul_retrans",
+}
+
+GRANULARITIES = {'hour': 'h', 'day': 'D'}
+KEYS = ['window_start', 'handset_type', 'metric']
+
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = np.log(GAMMA)
+ZERO_BUCKET = np.iinfo(np.int32).min
+
+QUERY_SESSIONS = f"""
+SELECT "Start"::timestamp AS "Start",
+       "End"::timestamp AS "End",
+       "Handset Type",
+       {', '.join(f'"{column}"' for column in METRICS)}
+FROM xdr_data
+"""
+
+QUERY_SESSIONS_SINCE = QUERY_SESSIONS + """WHERE COALESCE("End", "Start")::timestamp >= %(since)s
+"""
+
+
+# --- Quantile Sketch ---
+def sketch_buckets(values):
+    buckets = np.full(len(values), ZERO_BUCKET, dtype=np.int32)
+    positive = values > 0
+    buckets[positive] = np.ceil(np.log(values[positive]) / LOG_GAMMA).astype(np.int32)
+    return buckets
+
+
+def bucket_values(buckets):
+    buckets = np.asarray(buckets)
+    values = 2 * np.power(GAMMA, buckets.astype(np.float64)) / (GAMMA + 1)
+    return np.where(buckets == ZERO_BUCKET, 0.0, values)
+
+
+def quantile_label(q):
+    return f'p{q * 100:.10g}'
+
+
+# --- Aggregation and Merging ---
+# Time each session is attributed to: its end, falling back to its start
+def session_time(sessions):
+    start = pd.to_datetime(sessions[START])
+    if END not in sessions:
+        return start
+    return pd.to_datetime(sessions[END]).fillna(start)
+
+
+def aggregate_sessions(sessions):
+    frame = sessions[list(METRICS)].rename(columns=METRICS)
+    frame['window_start'] = session_time(sessions).dt.floor(GRANULARITIES['hour'])
+    frame['handset_type'] = sessions[HANDSET].fillna('undefined')
+    values = frame.melt(id_vars=['window_start', 'handset_type'], var_name='metric', value_name='value') \
+        .dropna(subset=['window_start', 'value'])
+
+    summary = values.groupby(KEYS, sort=False)['value'] \
+        .agg(count='count', sum='sum', min='min', max='max').reset_index()
+    values['bucket'] = sketch_buckets(values['value'].to_numpy(dtype=np.float64))
+    sketch = values.groupby([*KEYS, 'bucket'], sort=False).size().rename('count').reset_index()
+    return summary, sketch
+
+
+def merge_rollups(summaries, sketches):
+    # Empty tables (e.g. a first run) would otherwise turn window_start into object dtype
+    summaries = [frame for frame in summaries if not frame.empty] or summaries[:1]
+    sketches = [frame for frame in sketches if not frame.empty] or sketches[:1]
+    summary = pd.concat(summaries, ignore_index=True).groupby(KEYS, sort=False) \
+        .agg(count=('count', 'sum'), sum=('sum', 'sum'), min=('min', 'min'), max=('max', 'max')).reset_index()
+    sketch = pd.concat(sketches, ignore_index=True).groupby([*KEYS, 'bucket'], sort=False)['count'].sum().reset_index()
+    return summary, sketch
+
+
+def coarsen(summary, sketch, granularity):
+    freq = GRANULARITIES[granularity]
+    return merge_rollups(
+        [summary.assign(window_start=summary['window_start'].dt.floor(freq))],
+        [sketch.assign(window_start=sketch['window_start'].dt.floor(freq))],
+    )
+
+
+# --- Storage ---
+def _table_path(rollup_dir, granularity, table):
+    return os.path.join(rollup_dir, f'{granularity}_{table}.parquet')
+
+
+# Typed like stored tables, so merges and range queries work before the first refresh
+def _empty_rollups():
+    keys = {'window_start': pd.Series(dtype='datetime64[ns]'), 'handset_type': pd.Series(dtype=object),
+            'metric': pd.Series(dtype=object)}
+    summary = pd.DataFrame({**keys, 'count': pd.Series(dtype=np.int64), 'sum': pd.Series(dtype=np.float64),
+                            'min': pd.Series(dtype=np.float64), 'max': pd.Series(dtype=np.float64)})
+    sketch = pd.DataFrame({**keys, 'bucket': pd.Series(dtype=np.int32), 'count': pd.Series(dtype=np.int64)})
+    return summary, sketch
+
+
+def load_rollups(granularity, rollup_dir=DEFAULT_ROLLUP_DIR):
+    summary_path = _table_path(rollup_dir, granularity, 'summary')
+    if not os.path.exists(summary_path):
+        return _empty_rollups()
+    return pd.read_parquet(summary_path), pd.read_parquet(_table_path(rollup_dir, granularity, 'sketch'))
+
+
+def _save_rollups(summary, sketch, granularity, rollup_dir):
+    for table, frame in (('summary', summary), ('sketch', sketch)):
+        path = _table_path(rollup_dir, granularity, table)
+        frame.to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+
+
+def read_watermark(rollup_dir=DEFAULT_ROLLUP_DIR):
+    meta_path = os.path.join(rollup_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as handle:
+        watermark = json.load(handle).get('watermark')
+    return pd.Timestamp(watermark) if watermark else None
+
+
+def _write_watermark(watermark, rollup_dir):
+    with open(os.path.join(rollup_dir, 'meta.json'), 'w') as handle:
+        json.dump({'watermark': watermark.isoformat()}, handle)
+
+
+# --- Incremental Update ---
+# Windows at or after replace_from are rebuilt from `sessions` (which must then
+# hold every session from that point on); with replace_from=None the sessions
+# are treated as new data and merged into whatever windows they fall in.
+def update_rollups(sessions, rollup_dir=DEFAULT_ROLLUP_DIR, replace_from=None):
+    os.makedirs(rollup_dir, exist_ok=True)
+    new_summary, new_sketch = aggregate_sessions(sessions)
+    if new_summary.empty:
+        print("\nNo new sessions to roll up")
+        return
+
+    hour_summary, hour_sketch = load_rollups('hour', rollup_dir)
+    if replace_from is not None:
+        replace_from = pd.Timestamp(replace_from).floor(GRANULARITIES['hour'])
+        hour_summary = hour_summary[hour_summary['window_start'] < replace_from]
+        hour_sketch = hour_sketch[hour_sketch['window_start'] < replace_from]
+    hour_summary, hour_sketch = merge_rollups([hour_summary, new_summary], [hour_sketch, new_sketch])
+    _save_rollups(hour_summary, hour_sketch, 'hour', rollup_dir)
+
+    # Rebuild only the days that contain a touched hour, from the hourly tables
+    touched = new_summary['window_start'].min()
+    if replace_from is not None:
+        touched = min(touched, replace_from)
+    first_day = touched.floor(GRANULARITIES['day'])
+    day_summary, day_sketch = load_rollups('day', rollup_dir)
+    recent = hour_summary['window_start'] >= first_day
+    recent_sketch = hour_sketch['window_start'] >= first_day
+    fresh_summary, fresh_sketch = coarsen(hour_summary[recent], hour_sketch[recent_sketch], 'day')
+    day_summary, day_sketch = merge_rollups(
+        [day_summary[day_summary['window_start'] < first_day], fresh_summary],
+        [day_sketch[day_sketch['window_start'] < first_day], fresh_sketch],
+    )
+    _save_rollups(day_summary, day_sketch, 'day', rollup_dir)
+
+    watermark = session_time(sessions).max()
+    previous = read_watermark(rollup_dir)
+    _write_watermark(max(watermark, previous) if previous is not None else watermark, rollup_dir)
+    print(f"\nRolled up {len(sessions)} sessions into {new_summary['window_start'].nunique()} hourly windows")
+
+
+# Pull sessions from the last open hour onwards and refresh those windows
+def refresh_rollups(rollup_dir=DEFAULT_ROLLUP_DIR):
+    watermark = read_watermark(rollup_dir)
+    if watermark is None:
+        update_rollups(fetch_data(QUERY_SESSIONS), rollup_dir)
+        return
+    since = watermark.floor(GRANULARITIES['hour'])
+    update_rollups(fetch_data(QUERY_SESSIONS_SINCE, params={'since': since.to_pydatetime()}), rollup_dir, replace_from=since)
+
+
+# --- Range Queries ---
+def _sketch_quantiles(sketch, group_keys, quantiles):
+    sketch = sketch.sort_values([*group_keys, 'bucket'], ignore_index=True)
+    grouped = sketch.groupby(group_keys, sort=False)['count']
+    cumulative = grouped.cumsum()
+    total = grouped.transform('sum')
+    result = sketch[group_keys].drop_duplicates(ignore_index=True)
+    for q in quantiles:
+        reached = sketch[cumulative > q * (total - 1)]
+        first = reached.groupby(group_keys, sort=False).head(1)
+        estimate = first[group_keys].assign(**{quantile_label(q): bucket_values(first['bucket'])})
+        result = result.merge(estimate, on=group_keys, how='left')
+    return result
+
+
+def query_rollups(metric, start, end, granularity='hour', handsets=None, by_handset=True,
+                  collapse_windows=False, quantiles=(0.5, 0.9, 0.99), rollup_dir=DEFAULT_ROLLUP_DIR):
+    if metric not in METRICS.values():
+        raise ValueError(f"Unknown metric {metric!r}; expected one of {sorted(METRICS.values())}")
+    summary, sketch = load_rollups(granularity, rollup_dir)
+
+    def select(frame):
+        mask = (frame['metric'] == metric) & (frame['window_start'] >= pd.Timestamp(start)) \
+            & (frame['window_start'] < pd.Timestamp(end))
+        if handsets is not None:
+            mask &= frame['handset_type'].isin(handsets)
+        frame = frame[mask].copy()
+        if not by_handset:
+            frame['handset_type'] = 'all'
+        if collapse_windows:
+            frame['window_start'] = pd.Timestamp(start)
+        return frame
+
+    summary, sketch = merge_rollups([select(summary)], [select(sketch)])
+    summary['mean'] = summary['sum'] / summary['count']
+    result = summary.merge(_sketch_quantiles(sketch, KEYS, quantiles), on=KEYS, how='left')
+
+    # Bucket midpoints can fall just outside the exact extremes
+    for q in quantiles:
+        column = quantile_label(q)
+        result[column] = result[column].clip(result['min'], result['max'])
+    return result.drop(columns=['metric']).sort_values(['window_start', 'handset_type'], ignore_index=True)
+
+
+if __name__ == "__main__":
+    refresh_rollups()
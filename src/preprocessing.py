@@ -0,0 +1,142 @@
+import numpy as np
+
+# Schema-driven cleaning and imputation shared by the analysis modules.
+#
+# Each dataset declares which key columns must be present (rows missing them are
+# dropped), which numeric columns get mean imputation and which categorical
+# columns get mode imputation. Statistics are computed once per column (or per
+# handset group) from the frame or directly in the database, then applied column
+# by column to the missing positions only:
+#   - without copy-on-write, float columns are patched through their numpy buffer;
+#   - under copy-on-write (pandas >= 3) to_numpy() is read-only, so values are
+#     set with df.loc, which pandas writes in place as long as no other frame
+#     shares the column's block (otherwise it copies that block, not the frame).
+# Dropping rows always builds a new frame, so only the engagement and overview
+# datasets, which the previous cleaners already copied, declare required keys.
+# Experience and satisfaction rows without an MSISDN are kept with a missing key;
+# it is never mean-imputed.
+
+MSISDN = 'MSISDN/Number'
+
+EXPERIENCE_METRICS = ['avg_rtt_dl', 'avg_rtt_ul', 'avg_throughput_dl', 'avg_throughput_ul', 'tcp_dl_retrans', 'tcp_ul_retrans']
+
+SCHEMAS = {
+    'engagement': {
+        'required': [MSISDN],
+    },
+    'aggregated_users': {
+        'required': [MSISDN],
+    },
+    'experience': {
+        'impute_mean': EXPERIENCE_METRICS,
+        'impute_mode': ['handset_type'],
+    },
+    'satisfaction': {
+        'impute_mean': ['session_count', 'total_duration', 'total_download', 'total_upload', 'avg_rtt_dl', 'avg_throughput_dl', 'tcp_dl_retrans'],
+    },
+}
+
+
+# --- Imputation Statistics ---
+def compute_imputation_stats(df, schema_name, group_by=None):
+    schema = SCHEMAS[schema_name]
+    mean_columns = schema.get('impute_mean', [])
+    stats = {
+        'mean': {column: df[column].mean() for column in mean_columns},
+        'mode': {},
+        'group_by': group_by,
+        'group_mean': None,
+    }
+    for column in schema.get('impute_mode', []):
+        mode = df[column].mode()
+        stats['mode'][column] = mode.iloc[0] if not mode.empty else None
+    if group_by is not None and mean_columns:
+        stats['group_mean'] = df.groupby(group_by)[mean_columns].mean()
+    return stats
+
+
+# Same statistics computed by the database over the dataset's aggregate query
+def imputation_stats_from_db(query, schema_name, group_by=None):
+    from db_connection import fetch_data
+
+    schema = SCHEMAS[schema_name]
+    mean_columns = schema.get('impute_mean', [])
+    source = f"({query.strip().rstrip(';')}) AS source"
+    stats = {'mean': {}, 'mode': {}, 'group_by': group_by, 'group_mean': None}
+
+    if mean_columns:
+        means = fetch_data(f"SELECT {', '.join(f'AVG({column}) AS {column}' for column in mean_columns)} FROM {source}")
+        stats['mean'] = {column: means.at[0, column] for column in mean_columns}
+    for column in schema.get('impute_mode', []):
+        mode = fetch_data(f"SELECT {column} FROM {source} WHERE {column} IS NOT NULL "
+                          f"GROUP BY {column} ORDER BY COUNT(*) DESC LIMIT 1")
+        stats['mode'][column] = mode.at[0, column] if not mode.empty else None
+    if group_by is not None and mean_columns:
+        stats['group_mean'] = fetch_data(
+            f"SELECT {group_by}, {', '.join(f'AVG({column}) AS {column}' for column in mean_columns)} "
+            f"FROM {source} GROUP BY {group_by}"
+        ).set_index(group_by)
+    return stats
+
+
+# --- Applying Statistics ---
+def _fill_column(df, column, mask, fill):
+    # Check the dtype first: to_numpy() on a string column would box every value
+    if df[column].dtype.kind == 'f':
+        values = df[column].to_numpy()
+        if values.flags.writeable:
+            values[mask] = fill
+            return
+    df.loc[mask, column] = fill
+
+
+def apply_imputation(df, stats):
+    group_by = stats['group_by']
+
+    # Categorical columns first, so rows with an imputed handset pick up that handset's means
+    for column, mode in stats['mode'].items():
+        mask = df[column].isna().to_numpy()
+        if mask.any() and mode is not None:
+            _fill_column(df, column, mask, mode)
+
+    codes = groups = None
+    for column, mean in stats['mean'].items():
+        mask = df[column].isna().to_numpy()
+        if not mask.any():
+            continue
+        fill = mean
+        if stats['group_mean'] is not None:
+            if codes is None:
+                # Encode the group column once rather than converting it per metric
+                codes, groups = df[group_by].factorize()
+            # Trailing NaN serves code -1 (missing group)
+            table = np.append(stats['group_mean'][column].reindex(groups).to_numpy(dtype=np.float64), np.nan)
+            fill = table[codes[mask]]
+            # Groups with no observed values fall back to the global mean
+            fill = np.where(np.isnan(fill), mean, fill)
+        _fill_column(df, column, mask, fill)
+    return df
+
+
+def drop_missing_keys(df, columns):
+    if not columns:
+        return df
+    mask = df[columns].isna().any(axis=1).to_numpy()
+    # Only materialise a new frame when there are rows to remove; take() builds
+    # an independent frame, so later per-column writes need no defensive copy
+    return df.take(np.flatnonzero(~mask)) if mask.any() else df
+
+
+# --- Entry Point ---
+# Records how the frame was cleaned in df.attrs['preprocessing'], which the
+# feature store keys stored matrices on
+def preprocess(df, schema_name, stats=None, group_by=None):
+    if stats is not None and stats['group_by'] != group_by:
+        raise ValueError(f"Imputation stats were computed with group_by={stats['group_by']!r}, "
+                         f"but group_by={group_by!r} was requested")
+    df = drop_missing_keys(df, SCHEMAS[schema_name].get('required', []))
+    if stats is None:
+        stats = compute_imputation_stats(df, schema_name, group_by)
+    df = apply_imputation(df, stats)
+    df.attrs['preprocessing'] = {'schema': schema_name, 'group_by': group_by}
+    return df
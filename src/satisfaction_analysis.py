@@ -1,11 +1,16 @@
-from db_connection import fetch_data
+from db_connection import fetch_data, fetch_data_version
+from feature_store import materialize_features
 from mysql_connection import execute_mysql_query
+from preprocessing import preprocess
+from satisfaction_index import build_satisfaction_index
+from streaming_regression import accumulate_chunks, accumulate_partitions, load_stats, merge_stats, save_stats, solve_regression
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.cluster import KMeans
-from sklearn.preprocessing import MinMaxScaler
 from sklearn.metrics import euclidean_distances
-from sklearn.linear_model import LinearRegression
+
+SATISFACTION_FEATURES = ['session_count', 'total_duration', 'total_download', 'total_upload', 'avg_rtt_dl', 'avg_throughput_dl', 'tcp_dl_retrans']
 
 # Aggregate User Engagement and Experience Metrics
 QUERY_SATISFACTION = """
@@ -41,16 +46,14 @@ def load_satisfaction_data():
     return fetch_data(QUERY_SATISFACTION)
 
 # Data Cleaning
-def clean_satisfaction_data(df):
-    df.fillna(df.mean(numeric_only=True), inplace=True)
+def clean_satisfaction_data(df, stats=None):
+    df = preprocess(df, 'satisfaction', stats=stats)
     print(f"\nData after cleaning: {len(df)} rows remaining")
     return df
 
-# Normalize Data
-def normalize_data(df):
-    scaler = MinMaxScaler()
-    scaled_features = scaler.fit_transform(df[['session_count', 'total_duration', 'total_download', 'total_upload', 'avg_rtt_dl', 'avg_throughput_dl', 'tcp_dl_retrans']])
-    return scaled_features
+# Normalize Data (stored memory-mapped, reused while the data is unchanged)
+def normalize_data(df, version=None):
+    return materialize_features(df, SATISFACTION_FEATURES, 'satisfaction', version=version)
 
 # Compute Engagement and Experience Scores (Task 4.1)
 def compute_scores(df, scaled_data):
@@ -72,12 +75,41 @@ def compute_satisfaction_score(df):
     return df
 
 # Train Regression Model (Task 4.3)
-def train_regression_model(df):
-    X = df[['session_count', 'total_duration', 'total_download', 'total_upload', 'avg_rtt_dl', 'avg_throughput_dl', 'tcp_dl_retrans']]
-    y = df['satisfaction_score']
-    model = LinearRegression()
-    model.fit(X, y)
-    print("Regression Model Coefficients:", model.coef_)
+# The frame is reduced chunk by chunk to mergeable sufficient statistics, which
+# are saved so later runs can fold in new subscribers without the old rows.
+# The frame is already in memory, so accumulation is serial by default; pass
+# n_jobs only when the partitions are large enough to outweigh pickling them.
+REGRESSION_STATS_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '../data/processed/regression_stats.npz'))
+
+def _split_chunks(df, chunksize):
+    return [df.iloc[start:start + chunksize] for start in range(0, len(df), chunksize)]
+
+def _accumulate(df, chunksize, n_jobs):
+    chunks = _split_chunks(df, chunksize)
+    if n_jobs == 1:
+        return accumulate_chunks(chunks, SATISFACTION_FEATURES, 'satisfaction_score')
+    return accumulate_partitions(chunks, SATISFACTION_FEATURES, 'satisfaction_score', n_jobs=n_jobs)
+
+def _report_regression(model):
+    print("Regression Model Coefficients:", model['coef'])
+    print("Standard Errors:", model['std_err'])
+    print(f"Intercept: {model['intercept']:.6f}  R²: {model['r2']:.4f}  (n={model['n']})")
+
+def train_regression_model(df, chunksize=100_000, alpha=0.0, standardize=True, n_jobs=1, stats_path=REGRESSION_STATS_PATH):
+    stats = _accumulate(df, chunksize, n_jobs)
+    if stats_path:
+        save_stats(stats, stats_path)
+    model = solve_regression(stats, alpha=alpha, standardize=standardize)
+    _report_regression(model)
+    return model
+
+# Refit with New Subscribers Only, Reusing Saved Statistics
+def refit_regression_model(new_df, stats_path=REGRESSION_STATS_PATH, chunksize=100_000, alpha=0.0, standardize=True, n_jobs=1):
+    new_stats = _accumulate(new_df, chunksize, n_jobs)
+    stats = merge_stats(load_stats(stats_path), new_stats) if os.path.exists(stats_path) else new_stats
+    save_stats(stats, stats_path)
+    model = solve_regression(stats, alpha=alpha, standardize=standardize)
+    _report_regression(model)
     return model
 
 # Cluster Satisfaction and Experience Scores (Task 4.4)
@@ -105,13 +137,14 @@ def export_to_mysql(df):
 
 if __name__ == "__main__":
     # Load Data
+    data_version = fetch_data_version()
     satisfaction_data = load_satisfaction_data()
 
     # Clean Data
     satisfaction_data_cleaned = clean_satisfaction_data(satisfaction_data)
 
     # Normalize Data
-    normalized_data = normalize_data(satisfaction_data_cleaned)
+    normalized_data = normalize_data(satisfaction_data_cleaned, version=data_version)
 
     # Compute Scores
     scored_data = compute_scores(satisfaction_data_cleaned, normalized_data)
@@ -128,3 +161,6 @@ if __name__ == "__main__":
 
     # Export to MySQL
     export_to_mysql(clustered_data)
+
+    # Build Per-MSISDN Lookup Index
+    build_satisfaction_index(clustered_data)
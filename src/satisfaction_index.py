@@ -0,0 +1,211 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from versioned_store import current_path, current_version, new_version_dir, publish
+
+# Read-optimised per-MSISDN score index.
+#
+# Each index version is a directory of .npy files: a sorted int64 MSISDN array
+# plus one float32 array per score, all row-aligned. Versions are published
+# through versioned_store, so rebuilding never disturbs an open reader. Arrays
+# are memory-mapped on open so only the pages touched by a lookup are read, and
+# lookups are binary searches (np.searchsorted), which vectorise over a whole
+# batch of MSISDNs.
+
+SCORE_COLUMNS = ['engagement_score', 'experience_score', 'satisfaction_score']
+INT64_MIN, INT64_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+RELOAD_CHECK_SECONDS = 1.0
+DEFAULT_INDEX_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../data/processed/satisfaction_index'))
+
+
+# Build Index from Scored Satisfaction Data
+def build_satisfaction_index(df, index_dir=DEFAULT_INDEX_DIR, msisdn_column='MSISDN/Number'):
+    scored = df.dropna(subset=[msisdn_column])
+    msisdns = scored[msisdn_column].to_numpy(dtype=np.int64)
+    order = np.argsort(msisdns, kind='stable')
+    msisdns = msisdns[order]
+    if len(msisdns) == 0:
+        raise ValueError("No scored subscribers to index")
+    if len(msisdns) > 1 and (np.diff(msisdns) == 0).any():
+        raise ValueError("Duplicate MSISDNs in scored data; aggregate before indexing")
+
+    os.makedirs(index_dir, exist_ok=True)
+    version_dir = new_version_dir(index_dir)
+    np.save(os.path.join(version_dir, 'msisdn.npy'), msisdns)
+    for column in SCORE_COLUMNS:
+        np.save(os.path.join(version_dir, f'{column}.npy'), scored[column].to_numpy(dtype=np.float32)[order])
+
+    publish(index_dir, version_dir)
+    print(f"Satisfaction index with {len(msisdns)} subscribers written to {version_dir}")
+    return version_dir
+
+
+def _open_version(index_dir):
+    version_dir = current_path(index_dir)
+    if version_dir is None:
+        raise FileNotFoundError(f"No published satisfaction index in {index_dir}")
+    msisdns = np.load(os.path.join(version_dir, 'msisdn.npy'), mmap_mode='r')
+    scores = {
+        column: np.load(os.path.join(version_dir, f'{column}.npy'), mmap_mode='r')
+        for column in SCORE_COLUMNS
+    }
+    return os.path.basename(version_dir), msisdns, scores
+
+
+# Memory-mapped Index Reader
+# The (version, msisdns, scores) triple is swapped as one attribute, so a lookup
+# running during a reload reads a consistent version.
+class SatisfactionIndex:
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR):
+        self.index_dir = index_dir
+        self._state = _open_version(index_dir)
+        self._next_check = time.monotonic() + RELOAD_CHECK_SECONDS
+        self._reload_lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self._state[0]
+
+    def __len__(self):
+        return len(self._state[1])
+
+    # Reopen if a newer version was published; checked at most once per RELOAD_CHECK_SECONDS
+    def reload_if_changed(self):
+        if time.monotonic() < self._next_check or not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_check = time.monotonic() + RELOAD_CHECK_SECONDS
+            latest = current_version(self.index_dir)
+            if latest is None or latest == self._state[0]:
+                return False
+            self._state = _open_version(self.index_dir)
+            return True
+        finally:
+            self._reload_lock.release()
+
+    # Returns row positions and a mask of which MSISDNs were found
+    @staticmethod
+    def _locate(state, msisdns):
+        _, index_msisdns, _ = state
+        keys = np.asarray(msisdns, dtype=np.int64)
+        positions = np.searchsorted(index_msisdns, keys)
+        positions = np.minimum(positions, len(index_msisdns) - 1)
+        found = index_msisdns[positions] == keys
+        return positions, found
+
+    def lookup(self, msisdn):
+        state = self._state
+        positions, found = self._locate(state, [msisdn])
+        if not found[0]:
+            return None
+        row = positions[0]
+        return {column: float(values[row]) for column, values in state[2].items()}
+
+    # Batch lookup; missing MSISDNs get NaN scores and found=False
+    def lookup_many(self, msisdns):
+        state = self._state
+        positions, found = self._locate(state, msisdns)
+        result = {'msisdn': np.asarray(msisdns, dtype=np.int64), 'found': found}
+        for column, values in state[2].items():
+            batch = np.asarray(values[positions], dtype=np.float32)
+            batch[~found] = np.nan
+            result[column] = batch
+        return result
+
+
+# MSISDNs must be integers that fit the int64 index keys
+def _parse_msisdn(value):
+    if isinstance(value, bool):
+        raise ValueError("boolean is not an MSISDN")
+    msisdn = int(value)
+    if isinstance(value, float) and msisdn != value:
+        raise ValueError("MSISDN must be an integer")
+    if not INT64_MIN <= msisdn <= INT64_MAX:
+        raise ValueError("MSISDN out of range")
+    return msisdn
+
+
+# Local HTTP Endpoint
+#   GET  /score?msisdn=<n>              -> single subscriber
+#   POST /scores  {"msisdns": [...]}    -> batch lookup
+# The handler picks up newly published index versions without a restart.
+def _make_handler(index):
+    class SatisfactionIndexHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path != '/score':
+                self._send_json(404, {'error': 'not found'})
+                return
+            try:
+                msisdn = _parse_msisdn(parse_qs(url.query)['msisdn'][0])
+            except (KeyError, ValueError, OverflowError):
+                self._send_json(400, {'error': 'expected integer query parameter msisdn'})
+                return
+            index.reload_if_changed()
+            scores = index.lookup(msisdn)
+            if scores is None:
+                self._send_json(404, {'msisdn': msisdn, 'error': 'unknown msisdn'})
+            else:
+                self._send_json(200, {'msisdn': msisdn, **scores})
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/scores':
+                self._send_json(404, {'error': 'not found'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                requested = json.loads(self.rfile.read(length))['msisdns']
+                if not isinstance(requested, list):
+                    raise TypeError("msisdns must be a list")
+                msisdns = [_parse_msisdn(m) for m in requested]
+            except (KeyError, TypeError, ValueError, OverflowError):
+                self._send_json(400, {'error': 'expected JSON body {"msisdns": [integer, ...]}'})
+                return
+            index.reload_if_changed()
+            batch = index.lookup_many(msisdns)
+            results = []
+            for i, msisdn in enumerate(msisdns):
+                if batch['found'][i]:
+                    results.append({'msisdn': msisdn, **{column: float(batch[column][i]) for column in SCORE_COLUMNS}})
+                else:
+                    results.append({'msisdn': msisdn, 'error': 'unknown msisdn'})
+            self._send_json(200, {'results': results})
+
+        def log_message(self, format, *args):
+            pass
+
+    return SatisfactionIndexHandler
+
+
+def make_server(index_dir=DEFAULT_INDEX_DIR, host='127.0.0.1', port=8502):
+    return ThreadingHTTPServer((host, port), _make_handler(SatisfactionIndex(index_dir)))
+
+
+def serve(index_dir=DEFAULT_INDEX_DIR, host='127.0.0.1', port=8502):
+    server = make_server(index_dir, host, port)
+    print(f"Serving satisfaction scores from {index_dir} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    serve(*sys.argv[1:2])
@@ -0,0 +1,170 @@
+import os
+
+import numpy as np
+from joblib import Parallel, delayed
+
+# Streaming linear regression built on mergeable sufficient statistics.
+#
+# Each chunk of rows is reduced to its row count, feature/target means and the
+# centered cross-product matrices (the X'X, X'y and y'y blocks around the mean).
+# Chunk statistics merge exactly (Chan et al. pairwise update), so partitions can
+# be reduced in parallel and new subscribers folded in later without rereading
+# historical chunks. Keeping the blocks centered avoids the cancellation that raw
+# X'X suffers on byte/duration totals in the 1e9-1e12 range.
+
+
+# Empty Statistics
+def init_stats(n_features):
+    return {
+        'n': 0,
+        'mean_x': np.zeros(n_features),
+        'mean_y': 0.0,
+        'sxx': np.zeros((n_features, n_features)),
+        'sxy': np.zeros(n_features),
+        'syy': 0.0,
+    }
+
+
+# Reduce One Chunk to Sufficient Statistics
+def chunk_stats(X, y):
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64).ravel()
+    if X.ndim != 2 or X.shape[0] != y.shape[0]:
+        raise ValueError(f"X has shape {X.shape} but y has {y.shape[0]} rows")
+
+    stats = init_stats(X.shape[1])
+    if X.shape[0] == 0:
+        return stats
+
+    mean_x = X.mean(axis=0)
+    mean_y = y.mean()
+    Xc = X - mean_x
+    yc = y - mean_y
+    stats.update(
+        n=X.shape[0],
+        mean_x=mean_x,
+        mean_y=mean_y,
+        sxx=Xc.T @ Xc,
+        sxy=Xc.T @ yc,
+        syy=float(yc @ yc),
+    )
+    return stats
+
+
+# Merge Two Sets of Statistics
+def merge_stats(a, b):
+    if a['n'] == 0:
+        return b
+    if b['n'] == 0:
+        return a
+
+    n = a['n'] + b['n']
+    weight = a['n'] * b['n'] / n
+    dx = b['mean_x'] - a['mean_x']
+    dy = b['mean_y'] - a['mean_y']
+    return {
+        'n': n,
+        'mean_x': a['mean_x'] + dx * b['n'] / n,
+        'mean_y': a['mean_y'] + dy * b['n'] / n,
+        'sxx': a['sxx'] + b['sxx'] + np.outer(dx, dx) * weight,
+        'sxy': a['sxy'] + b['sxy'] + dx * dy * weight,
+        'syy': a['syy'] + b['syy'] + dy * dy * weight,
+    }
+
+
+# Accumulate an Iterable of DataFrame Chunks
+def accumulate_chunks(chunks, feature_columns, target_column, stats=None):
+    if stats is None:
+        stats = init_stats(len(feature_columns))
+    for chunk in chunks:
+        stats = merge_stats(stats, chunk_stats(chunk[feature_columns], chunk[target_column]))
+    return stats
+
+
+def _partition_stats(partition, feature_columns, target_column):
+    # A partition is either a DataFrame or an iterable of DataFrame chunks
+    if hasattr(partition, 'columns'):
+        partition = [partition]
+    return accumulate_chunks(partition, feature_columns, target_column)
+
+
+# Accumulate Partitions in Parallel and Merge
+def accumulate_partitions(partitions, feature_columns, target_column, n_jobs=-1):
+    partial = Parallel(n_jobs=n_jobs)(
+        delayed(_partition_stats)(partition, feature_columns, target_column)
+        for partition in partitions
+    )
+    stats = init_stats(len(feature_columns))
+    for part in partial:
+        stats = merge_stats(stats, part)
+    return stats
+
+
+# Solve for Coefficients, R² and Standard Errors
+def solve_regression(stats, alpha=0.0, standardize=True):
+    n = stats['n']
+    p = len(stats['mean_x'])
+    if n < 2:
+        raise ValueError(f"Need at least 2 rows to fit a regression, got {n}")
+
+    sxx, sxy, syy = stats['sxx'], stats['sxy'], stats['syy']
+
+    # Standardizing rescales every feature to unit variance so a single ridge
+    # penalty treats them equally and the normal equations are well conditioned
+    if standardize:
+        scale = np.sqrt(np.diag(sxx) / (n - 1))
+        scale[scale == 0] = 1.0
+    else:
+        scale = np.ones(p)
+
+    z_xx = sxx / np.outer(scale, scale)
+    z_xy = sxy / scale
+    lhs = z_xx + alpha * np.eye(p)
+    coef_scaled = np.linalg.lstsq(lhs, z_xy, rcond=None)[0]
+    coef = coef_scaled / scale
+    intercept = stats['mean_y'] - stats['mean_x'] @ coef
+
+    sse = max(syy - 2 * coef @ sxy + coef @ sxx @ coef, 0.0)
+    r2 = 1.0 - sse / syy if syy > 0 else 0.0
+
+    # Sandwich covariance; reduces to sigma² (X'X)^-1 when alpha == 0
+    dof = n - p - 1
+    sigma2 = sse / dof if dof > 0 else np.nan
+    lhs_inv = np.linalg.pinv(lhs)
+    cov_scaled = sigma2 * lhs_inv @ z_xx @ lhs_inv
+    std_err = np.sqrt(np.clip(np.diag(cov_scaled), 0.0, None)) / scale
+
+    return {
+        'coef': coef,
+        'intercept': intercept,
+        'r2': r2,
+        'std_err': std_err,
+        'n': n,
+        'alpha': alpha,
+        'standardize': standardize,
+    }
+
+
+# Predict with a Solved Model
+def predict(model, X):
+    return np.asarray(X, dtype=np.float64) @ model['coef'] + model['intercept']
+
+
+# Persist Statistics for Incremental Refits
+def save_stats(stats, path):
+    # Write through a handle so numpy does not append ".npz" to the path
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'wb') as handle:
+        np.savez(handle, **stats)
+
+
+def load_stats(path):
+    with np.load(path) as data:
+        return {
+            'n': int(data['n']),
+            'mean_x': data['mean_x'],
+            'mean_y': float(data['mean_y']),
+            'sxx': data['sxx'],
+            'sxy': data['sxy'],
+            'syy': float(data['syy']),
+        }
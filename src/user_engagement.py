@@ -1,8 +1,9 @@
-from db_connection import fetch_data
+from db_connection import fetch_data, fetch_data_version
+from feature_store import materialize_features
+from preprocessing import preprocess
 import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.cluster import KMeans
-from sklearn.preprocessing import MinMaxScaler
 from yellowbrick.cluster import KElbowVisualizer
 
 # SQL Query to Aggregate User Engagement Metrics
@@ -23,15 +24,13 @@ def load_engagement_data():
 
 # Data Cleaning
 def clean_engagement_data(df):
-    df_cleaned = df.dropna(subset=["MSISDN/Number"]).copy()
+    df_cleaned = preprocess(df, 'engagement')
     print(f"\nData after cleaning: {len(df_cleaned)} rows remaining")
     return df_cleaned
 
-# Normalize Data for Clustering
-def normalize_data(df):
-    scaler = MinMaxScaler()
-    scaled_features = scaler.fit_transform(df[['session_count', 'total_duration', 'total_download', 'total_upload']])
-    return scaled_features
+# Normalize Data for Clustering (stored memory-mapped, reused while the data is unchanged)
+def normalize_data(df, version=None):
+    return materialize_features(df, ['session_count', 'total_duration', 'total_download', 'total_upload'], 'engagement', version=version)
 
 # Determine Optimal K using Elbow Method
 def find_optimal_k(data):
@@ -70,13 +69,14 @@ def visualize_top_apps(app_data):
 
 if __name__ == "__main__":
     # Load Data
+    data_version = fetch_data_version()
     engagement_data = load_engagement_data()
 
     # Clean Data
     engagement_data_cleaned = clean_engagement_data(engagement_data)
 
     # Normalize Data
-    normalized_data = normalize_data(engagement_data_cleaned)
+    normalized_data = normalize_data(engagement_data_cleaned, version=data_version)
 
     # Find Optimal K
     optimal_k = find_optimal_k(normalized_data)
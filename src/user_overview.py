@@ -13,6 +13,7 @@ from visual_exports import export_visualizations
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../scripts')))
 
 from db_connection import fetch_data
+from preprocessing import preprocess
 
 
 # SQL Queries for Analysis
@@ -78,7 +79,7 @@ def load_aggregated_user_data():
 
 # --- Data Cleaning ---
 def clean_aggregated_data(df):
-    df_cleaned = df.dropna(subset=["MSISDN/Number"]).copy()
+    df_cleaned = preprocess(df, 'aggregated_users')
     print(f"\nData after cleaning (NaN removed): {len(df_cleaned)} rows remaining")
     return df_cleaned
 
@@ -0,0 +1,49 @@
+import os
+import shutil
+import time
+
+# Atomic publication of directory-based artifacts.
+#
+# A store root holds immutable version directories (v<timestamp_ns>) and a
+# CURRENT file naming the live one. Writers fill a fresh version directory and
+# then replace CURRENT with os.replace, which is atomic, so a reader either sees
+# the previous complete version or the new complete version. The previous
+# version is kept after publishing so readers that resolved CURRENT just before
+# the swap can still open its files; older ones are pruned. Assumes one writer
+# per store root at a time.
+
+POINTER = 'CURRENT'
+
+
+def new_version_dir(root):
+    path = os.path.join(root, f'v{time.time_ns()}')
+    os.makedirs(path)
+    return path
+
+
+def current_version(root):
+    try:
+        with open(os.path.join(root, POINTER)) as handle:
+            return handle.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def current_path(root):
+    version = current_version(root)
+    return os.path.join(root, version) if version else None
+
+
+def publish(root, version_path):
+    version = os.path.basename(version_path)
+    previous = current_version(root)
+    tmp_pointer = os.path.join(root, POINTER + '.tmp')
+    with open(tmp_pointer, 'w') as handle:
+        handle.write(version)
+    os.replace(tmp_pointer, os.path.join(root, POINTER))
+
+    keep = {version, previous}
+    for name in os.listdir(root):
+        if name.startswith('v') and name not in keep:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    return version_path
@@ -0,0 +1,248 @@
+import glob
+import io
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Parallel aggregation of raw xDR CSV/Parquet drops into the per-MSISDN features
+# the SQL in user_overview, user_engagement, experiance_analytics and
+# satisfaction_analysis computes, without loading the drop into Postgres first.
+#
+# Map:    each worker reads one unit of input (a byte range of a CSV file or one
+#         Parquet row group), reduces it to partial sums/counts per
+#         (MSISDN, handset) and spills them, hash-partitioned by MSISDN, to disk.
+# Reduce: each worker merges all spills of one partition and derives the final
+#         columns. A subscriber lives in exactly one partition, so partitions
+#         never need to be combined beyond concatenation.
+#
+# Memory per worker is bounded by the CSV block size / row group size on the map
+# side and by one partition's partials on the reduce side; both are independent
+# of the total input size.
+
+MSISDN = "MSISDN/Number"
+HANDSET = "Handset Type"
+
+APP_COLUMNS = [
+    "Social Media DL (Bytes)", "Social Media UL (Bytes)",
+    "Google DL (Bytes)", "Google UL (Bytes)",
+    "Email DL (Bytes)", "Email UL (Bytes)",
+    "Youtube DL (Bytes)", "Youtube UL (Bytes)",
+    "Netflix DL (Bytes)", "Netflix UL (Bytes)",
+    "Gaming DL (Bytes)", "Gaming UL (Bytes)"
+]
+
+# Raw column -> output name for SUM(...) features
+SUM_COLUMNS = {
+    "Dur. (ms)": "total_duration",
+    "Total DL (Bytes)": "total_download",
+    "Total UL (Bytes)": "total_upload",
+    **{column: column for column in APP_COLUMNS},
+}
+
+# Raw column -> output name for AVG(...) features
+AVG_COLUMNS = {
+    "Avg RTT DL (ms)": "avg_rtt_dl",
+    "Avg RTT UL (ms)": "avg_rtt_ul",
+    "Avg Bearer TP DL (kbps)": "avg_throughput_dl",
+    "Avg Bearer TP UL (kbps)": "avg_throughput_ul",
+    "TCP DL Retrans. Vol (Bytes)": "tcp_dl_retrans",
+    "TCP UL Retrans. Vol (Bytes)": "tcp_ul_retrans",
+}
+
+RAW_COLUMNS = [MSISDN, HANDSET, *SUM_COLUMNS, *AVG_COLUMNS]
+KEYS = [MSISDN, HANDSET]
+
+CSV_BLOCK_SIZE = 64 * 1024 * 1024
+COMPACT_EVERY = 16
+
+
+# --- Input Discovery ---
+def _csv_units(path, block_size):
+    # Byte ranges aligned on line starts by the reader; assumes no quoted newlines
+    with open(path, 'rb') as handle:
+        header = handle.readline()
+        data_start = handle.tell()
+    size = os.path.getsize(path)
+    return [('csv', path, header, start, min(start + block_size, size))
+            for start in range(data_start, size, block_size)]
+
+
+def _parquet_units(path):
+    return [('parquet', path, group) for group in range(pq.ParquetFile(path).num_row_groups)]
+
+
+def plan_units(paths, block_size=CSV_BLOCK_SIZE):
+    units = []
+    for path in paths:
+        if path.endswith('.parquet') or path.endswith('.pq'):
+            units.extend(_parquet_units(path))
+        elif path.endswith('.csv'):
+            units.extend(_csv_units(path, block_size))
+        else:
+            raise ValueError(f"Unsupported xDR file type: {path}")
+    return units
+
+
+# --- Map Side ---
+def _read_csv_range(path, header, start, end):
+    # A line belongs to the range it starts in: skip the partial line at the
+    # front and finish the line that straddles the end
+    with open(path, 'rb') as handle:
+        handle.seek(start - 1)
+        handle.readline()
+        position = handle.tell()
+        block = handle.read(max(end - position, 0))
+        if block and not block.endswith(b'\n'):
+            block += handle.readline()
+    if not block:
+        return pd.DataFrame(columns=RAW_COLUMNS)
+    return pd.read_csv(io.BytesIO(header + block), usecols=RAW_COLUMNS)
+
+
+def _read_unit(unit):
+    if unit[0] == 'csv':
+        _, path, header, start, end = unit
+        return _read_csv_range(path, header, start, end)
+    _, path, group = unit
+    return pq.ParquetFile(path).read_row_group(group, columns=RAW_COLUMNS).to_pandas()
+
+
+def partial_aggregate(raw):
+    # Sums and non-null counts are mergeable; averages are derived at the end
+    frame = pd.DataFrame({MSISDN: raw[MSISDN].astype(np.float64), HANDSET: raw[HANDSET], 'rows': 1})
+    for column, name in SUM_COLUMNS.items():
+        frame[name] = raw[column]
+    for column, name in AVG_COLUMNS.items():
+        frame[f'{name}__sum'] = raw[column]
+        frame[f'{name}__count'] = raw[column].notna().astype(np.int64)
+    return _merge_partials(frame)
+
+
+def _merge_partials(frame):
+    # min_count=1 keeps SQL semantics: SUM over only NULLs stays NULL
+    return frame.groupby(KEYS, dropna=False, sort=False).sum(min_count=1).reset_index()
+
+
+def partition_of(msisdns, n_partitions):
+    keys = msisdns.fillna(-1).to_numpy(dtype=np.int64)
+    return pd.util.hash_array(keys) % n_partitions
+
+
+def _map_unit(unit_id, unit, spill_dir, n_partitions):
+    partial = partial_aggregate(_read_unit(unit))
+    partitions = partition_of(partial[MSISDN], n_partitions)
+    for partition, group in partial.groupby(partitions, sort=False):
+        group.to_parquet(os.path.join(spill_dir, f'part-{partition:05d}', f'unit-{unit_id:06d}.parquet'), index=False)
+    return len(partial)
+
+
+# --- Reduce Side ---
+def finalize(partial):
+    experience = partial[KEYS].rename(columns={HANDSET: 'handset_type'})
+    for name in AVG_COLUMNS.values():
+        experience[name] = partial[f'{name}__sum'] / partial[f'{name}__count'].replace(0, np.nan)
+
+    # Collapse handsets to one row per subscriber
+    per_user = partial.drop(columns=[HANDSET]).groupby(MSISDN, dropna=False, sort=False).sum(min_count=1)
+    users = pd.DataFrame({'session_count': per_user['rows'].astype(np.int64)}, index=per_user.index)
+    for name in SUM_COLUMNS.values():
+        users[name] = per_user[name]
+    for name in AVG_COLUMNS.values():
+        users[name] = per_user[f'{name}__sum'] / per_user[f'{name}__count'].replace(0, np.nan)
+    return experience, users.reset_index()
+
+
+def _reduce_partition(partition_dir):
+    pending = []
+    merged = None
+    for path in sorted(glob.glob(os.path.join(partition_dir, '*.parquet'))):
+        pending.append(pd.read_parquet(path))
+        if len(pending) >= COMPACT_EVERY:
+            merged = _merge_partials(pd.concat(pending if merged is None else [merged, *pending], ignore_index=True))
+            pending = []
+    if pending:
+        merged = _merge_partials(pd.concat(pending if merged is None else [merged, *pending], ignore_index=True))
+    if merged is None:
+        return None
+    return finalize(merged)
+
+
+# --- Feature Views Matching the SQL Queries ---
+def build_views(experience, users):
+    engagement = users[[MSISDN, 'session_count', 'total_duration', 'total_download', 'total_upload']] \
+        .sort_values('session_count', ascending=False, ignore_index=True)
+
+    app_engagement = pd.DataFrame({
+        MSISDN: users[MSISDN],
+        'youtube_traffic': users["Youtube DL (Bytes)"] + users["Youtube UL (Bytes)"],
+        'netflix_traffic': users["Netflix DL (Bytes)"] + users["Netflix UL (Bytes)"],
+        'social_traffic': users["Social Media DL (Bytes)"] + users["Social Media UL (Bytes)"],
+    }).sort_values('youtube_traffic', ascending=False, ignore_index=True)
+
+    aggregated_users = users[[MSISDN, 'session_count', 'total_upload', 'total_download', 'total_duration', *APP_COLUMNS]] \
+        .sort_values('session_count', ascending=False, ignore_index=True)
+
+    # QUERY_SATISFACTION inner-joins on the MSISDN, which drops the NULL-MSISDN group
+    satisfaction = users.loc[users[MSISDN].notna(),
+                             [MSISDN, 'session_count', 'total_duration', 'total_download', 'total_upload',
+                              'avg_rtt_dl', 'avg_throughput_dl', 'tcp_dl_retrans']].reset_index(drop=True)
+
+    experience = experience[[MSISDN, *AVG_COLUMNS.values(), 'handset_type']].reset_index(drop=True)
+
+    return {
+        'engagement': engagement,               # user_engagement.QUERY_ENGAGEMENT
+        'app_engagement': app_engagement,       # user_engagement.QUERY_APP_ENGAGEMENT
+        'experience': experience,               # experiance_analytics.QUERY_EXPERIENCE
+        'aggregated_users': aggregated_users,   # user_overview.QUERY_AGGREGATE_USERS
+        'satisfaction': satisfaction,           # satisfaction_analysis.QUERY_SATISFACTION
+    }
+
+
+# --- Entry Point ---
+def ingest_xdr(paths, n_workers=None, n_partitions=None, block_size=CSV_BLOCK_SIZE, spill_dir=None):
+    n_workers = n_workers or os.cpu_count() or 1
+    n_partitions = n_partitions or 4 * n_workers
+    units = plan_units(paths, block_size)
+
+    spill_root = tempfile.mkdtemp(prefix='xdr_spill_', dir=spill_dir)
+    try:
+        for partition in range(n_partitions):
+            os.makedirs(os.path.join(spill_root, f'part-{partition:05d}'))
+
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(_map_unit, unit_id, unit, spill_root, n_partitions)
+                       for unit_id, unit in enumerate(units)]
+            for future in futures:
+                future.result()
+
+            partition_dirs = [os.path.join(spill_root, f'part-{partition:05d}') for partition in range(n_partitions)]
+            results = [result for result in pool.map(_reduce_partition, partition_dirs) if result is not None]
+    finally:
+        shutil.rmtree(spill_root, ignore_errors=True)
+
+    if results:
+        experience = pd.concat([result[0] for result in results], ignore_index=True)
+        users = pd.concat([result[1] for result in results], ignore_index=True)
+    else:
+        experience, users = finalize(partial_aggregate(pd.DataFrame(columns=RAW_COLUMNS)))
+
+    print(f"\nAggregated {len(units)} input units into {len(users)} subscribers")
+    return build_views(experience, users)
+
+
+def export_views(views, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    for name, frame in views.items():
+        frame.to_parquet(os.path.join(output_dir, f'{name}.parquet'), index=False)
+    print(f"Feature tables written to {output_dir}")
+
+
+if __name__ == "__main__":
+    output_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../data/processed/xdr_features'))
+    export_views(ingest_xdr(sys.argv[1:]), output_dir)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from feature_store import attach_msisdns, current_entry, materialize_features
+from preprocessing import EXPERIENCE_METRICS, preprocess
+
+MSISDN = 'MSISDN/Number'
+COLUMNS = ['avg_rtt_dl', 'avg_throughput_dl']
+
+
+def make_frame(n=50, seed=5):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        MSISDN: 33_600_000_000 + np.arange(n, dtype=np.float64),
+        **{metric: rng.random(n) * 1e3 for metric in EXPERIENCE_METRICS},
+        'handset_type': np.array(['Apple iPhone 6S', 'Samsung Galaxy S8'], dtype=object)[rng.integers(0, 2, n)],
+    })
+
+
+def scaled(df):
+    values = df[COLUMNS].to_numpy()
+    return (values - values.min(axis=0)) / (values.max(axis=0) - values.min(axis=0))
+
+
+def test_reuse_follows_the_incoming_row_order(tmp_path):
+    df = pd.DataFrame({MSISDN: [1.0, 2.0, 3.0], 'avg_rtt_dl': [10.0, 20.0, 30.0], 'avg_throughput_dl': [1.0, 2.0, 3.0]})
+    materialize_features(df, COLUMNS, 'entry', version='v1', store_dir=str(tmp_path))
+    stored_version = current_entry('entry', str(tmp_path))
+
+    reordered = df.iloc[[2, 0, 1]].reset_index(drop=True)
+    features = materialize_features(reordered, COLUMNS, 'entry', version='v1', store_dir=str(tmp_path))
+    assert current_entry('entry', str(tmp_path)) == stored_version
+    np.testing.assert_array_equal(features[:, 0], [1.0, 0.0, 0.5])
+
+
+def test_reuse_with_shuffled_composite_keys(tmp_path):
+    df = make_frame()
+    # Same subscriber on two handsets: the MSISDN alone is ambiguous
+    df.loc[1, MSISDN] = df.loc[0, MSISDN]
+    df.loc[1, 'handset_type'] = 'Huawei P20'
+    keys = [MSISDN, 'handset_type']
+    materialize_features(df, COLUMNS, 'entry', version='v1', store_dir=str(tmp_path), key_columns=keys)
+
+    shuffled = df.sample(frac=1, random_state=0).reset_index(drop=True)
+    features = materialize_features(shuffled, COLUMNS, 'entry', version='v1', store_dir=str(tmp_path), key_columns=keys)
+    np.testing.assert_allclose(features, scaled(shuffled))
+
+
+def test_rows_that_cannot_be_matched_are_rebuilt(tmp_path):
+    df = make_frame()
+    materialize_features(df, COLUMNS, 'entry', version='v1', store_dir=str(tmp_path))
+    stored_version = current_entry('entry', str(tmp_path))
+
+    # Same version and row count but a different subscriber
+    changed = df.copy()
+    changed.loc[0, MSISDN] = 1.0
+    features = materialize_features(changed, COLUMNS, 'entry', version='v1', store_dir=str(tmp_path))
+    assert current_entry('entry', str(tmp_path)) != stored_version
+    np.testing.assert_array_equal(attach_msisdns(current_entry('entry', str(tmp_path))), changed[MSISDN])
+    np.testing.assert_allclose(features, scaled(changed))
+
+
+def test_different_cleaning_is_not_reused(tmp_path):
+    raw = make_frame()
+    raw.loc[::7, 'avg_rtt_dl'] = np.nan
+
+    global_mean = preprocess(raw.copy(), 'experience')
+    materialize_features(global_mean, COLUMNS, 'experience', version='v1', store_dir=str(tmp_path))
+
+    by_handset = preprocess(raw.copy(), 'experience', group_by='handset_type')
+    features = materialize_features(by_handset, COLUMNS, 'experience', version='v1', store_dir=str(tmp_path))
+    np.testing.assert_allclose(features, scaled(by_handset))
+    assert not np.allclose(scaled(by_handset), scaled(global_mean))
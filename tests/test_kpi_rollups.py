@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kpi_rollups import (END, HANDSET, KEYS, METRICS, RELATIVE_ACCURACY, START, load_rollups, query_rollups,
+                         read_watermark, update_rollups)
+
+
+def make_sessions(n=3000, seed=3):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2019-04-01') + pd.to_timedelta(rng.integers(0, 3 * 24 * 3600, n), unit='s')
+    sessions = pd.DataFrame({
+        START: start,
+        # Some sessions run across several hours; a few have no recorded end
+        END: start + pd.to_timedelta(rng.integers(0, 4 * 3600, n), unit='s'),
+        HANDSET: np.array(['Apple iPhone 6S', 'Samsung Galaxy S8', None], dtype=object)[rng.integers(0, 3, n)],
+    })
+    sessions.loc[rng.random(n) < 0.02, END] = pd.NaT
+    for column in METRICS:
+        values = rng.lognormal(mean=4, sigma=1.5, size=n)
+        values[rng.random(n) < 0.05] = np.nan
+        values[rng.random(n) < 0.02] = 0.0
+        sessions[column] = values
+    return sessions
+
+
+def sorted_rollups(granularity, rollup_dir):
+    summary, sketch = load_rollups(granularity, rollup_dir)
+    return (summary.sort_values(KEYS, ignore_index=True),
+            sketch.sort_values([*KEYS, 'bucket'], ignore_index=True))
+
+
+def test_incremental_refresh_matches_full_rebuild(tmp_path):
+    sessions = make_sessions()
+    session_time = sessions[END].fillna(sessions[START])
+    cutoff = pd.Timestamp('2019-04-02 13:37')
+
+    incremental = tmp_path / 'incremental'
+    update_rollups(sessions[session_time < cutoff], str(incremental))
+    # What refresh_rollups fetches: everything from the watermark's hour onwards
+    since = read_watermark(str(incremental)).floor('h')
+    update_rollups(sessions[session_time >= since], str(incremental), replace_from=since)
+
+    full = tmp_path / 'full'
+    update_rollups(sessions, str(full))
+
+    for granularity in ('hour', 'day'):
+        got_summary, got_sketch = sorted_rollups(granularity, str(incremental))
+        want_summary, want_sketch = sorted_rollups(granularity, str(full))
+        pd.testing.assert_frame_equal(got_summary, want_summary, check_dtype=False)
+        pd.testing.assert_frame_equal(got_sketch, want_sketch, check_dtype=False)
+    assert read_watermark(str(incremental)) == read_watermark(str(full)) == session_time.max()
+
+
+def test_sessions_are_attributed_to_their_end_hour(tmp_path):
+    sessions = make_sessions(n=1)
+    sessions[START] = pd.Timestamp('2019-04-01 10:50')
+    sessions[END] = pd.Timestamp('2019-04-01 12:10')
+    sessions["Avg RTT DL (ms)"] = 42.0
+    update_rollups(sessions, str(tmp_path))
+
+    result = query_rollups('rtt_dl', '2019-04-01', '2019-04-02', rollup_dir=str(tmp_path))
+    assert list(result['window_start']) == [pd.Timestamp('2019-04-01 12:00')]
+
+
+def test_sketch_quantiles_within_relative_accuracy(tmp_path):
+    sessions = make_sessions(n=20_000, seed=11)
+    update_rollups(sessions, str(tmp_path))
+    quantiles = (0.1, 0.5, 0.9, 0.99, 0.995, 0.999)
+
+    result = query_rollups('throughput_dl', '2019-04-01', '2019-04-10', granularity='day', by_handset=False,
+                           collapse_windows=True, quantiles=quantiles, rollup_dir=str(tmp_path))
+    assert len(result) == 1
+    values = sessions["Avg Bearer TP DL (kbps)"].dropna().to_numpy()
+    row = result.iloc[0]
+    assert row['count'] == len(values)
+    assert row['mean'] == pytest.approx(values.mean())
+    assert (row['min'], row['max']) == (values.min(), values.max())
+    for q, label in zip(quantiles, ['p10', 'p50', 'p90', 'p99', 'p99.5', 'p99.9']):
+        exact = np.quantile(values, q, method='lower')
+        assert row[label] == pytest.approx(exact, rel=RELATIVE_ACCURACY * 1.0001, abs=1e-12)
+
+
+def test_query_before_first_refresh_returns_empty_result(tmp_path):
+    for kwargs in ({}, {'granularity': 'day', 'by_handset': False, 'collapse_windows': True}):
+        result = query_rollups('rtt_dl', '2019-04-01', '2019-04-02', rollup_dir=str(tmp_path / 'empty'), **kwargs)
+        assert result.empty
+        assert list(result.columns) == ['window_start', 'handset_type', 'count', 'sum', 'min', 'max', 'mean',
+                                         'p50', 'p90', 'p99']
+        assert pd.api.types.is_datetime64_any_dtype(result['window_start'])
+
+
+def test_first_update_into_empty_store(tmp_path):
+    sessions = make_sessions(n=200)
+    update_rollups(sessions, str(tmp_path))
+    summary, _ = load_rollups('hour', str(tmp_path))
+    assert pd.api.types.is_datetime64_any_dtype(summary['window_start'])
+    assert summary['count'].sum() == sessions[list(METRICS)].notna().sum().sum()
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocessing import EXPERIENCE_METRICS, MSISDN, SCHEMAS, compute_imputation_stats, preprocess
+
+
+def experience_frame():
+    frame = pd.DataFrame({
+        MSISDN: [1.0, 2.0, np.nan, 4.0, 5.0, 6.0],
+        'handset_type': ['A', 'A', 'B', None, 'C', 'A'],
+    })
+    for i, metric in enumerate(EXPERIENCE_METRICS):
+        frame[metric] = np.array([10.0, 20.0, 30.0, 40.0, 50.0, 60.0]) * (i + 1)
+    return frame
+
+
+def test_handset_mode_is_filled_in_place():
+    df = experience_frame()
+    result = preprocess(df, 'experience')
+    assert result is df
+    assert list(df['handset_type']) == ['A', 'A', 'B', 'A', 'C', 'A']
+
+
+def test_global_mean_fill_writes_into_the_callers_frame():
+    df = experience_frame()
+    df.loc[[1, 4], 'avg_rtt_dl'] = np.nan
+    preprocess(df, 'experience')
+    np.testing.assert_allclose(df['avg_rtt_dl'], [10.0, 35.0, 30.0, 40.0, 35.0, 60.0])
+
+
+def test_group_means_fall_back_to_the_global_mean():
+    df = experience_frame()
+    # Handset C has no observed RTT; handset A keeps two observations
+    df.loc[[1, 4], 'avg_rtt_dl'] = np.nan
+    preprocess(df, 'experience', group_by='handset_type')
+    # Statistics come from the frame before imputation, so row 3 (unknown
+    # handset) only counts towards the global mean
+    a_mean = np.mean([10.0, 60.0])
+    global_mean = np.mean([10.0, 30.0, 40.0, 60.0])
+    assert df.loc[1, 'avg_rtt_dl'] == pytest.approx(a_mean)
+    assert df.loc[4, 'avg_rtt_dl'] == pytest.approx(global_mean)
+
+
+def test_precomputed_stats_with_unseen_group():
+    stats = compute_imputation_stats(experience_frame().iloc[:3], 'experience', group_by='handset_type')
+    df = experience_frame()
+    df.loc[[0, 4], 'avg_throughput_dl'] = np.nan
+    preprocess(df, 'experience', stats=stats, group_by='handset_type')
+    # A was seen when the stats were computed, C was not
+    assert df.loc[0, 'avg_throughput_dl'] == pytest.approx(stats['group_mean'].loc['A', 'avg_throughput_dl'])
+    assert df.loc[4, 'avg_throughput_dl'] == pytest.approx(stats['mean']['avg_throughput_dl'])
+
+
+def test_mismatched_group_by_is_rejected():
+    stats = compute_imputation_stats(experience_frame(), 'experience', group_by='handset_type')
+    with pytest.raises(ValueError, match='group_by'):
+        preprocess(experience_frame(), 'experience', stats=stats)
+    stats = compute_imputation_stats(experience_frame(), 'experience')
+    with pytest.raises(ValueError, match='group_by'):
+        preprocess(experience_frame(), 'experience', stats=stats, group_by='handset_type')
+
+
+@pytest.mark.parametrize('schema_name', ['experience', 'satisfaction'])
+def test_msisdn_is_never_mean_imputed(schema_name):
+    if schema_name == 'experience':
+        df = experience_frame()
+    else:
+        df = pd.DataFrame({MSISDN: [1.0, np.nan, 3.0]})
+        for column in SCHEMAS['satisfaction']['impute_mean']:
+            df[column] = [1.0, np.nan, 3.0]
+    n_rows = len(df)
+    result = preprocess(df, schema_name)
+    assert len(result) == n_rows
+    assert result[MSISDN].isna().sum() == 1
+    for column in SCHEMAS[schema_name]['impute_mean']:
+        assert result[column].notna().all()
+
+
+def test_required_keys_drop_rows():
+    df = pd.DataFrame({MSISDN: [1.0, np.nan, 3.0], 'session_count': [1, 2, 3]})
+    result = preprocess(df, 'engagement')
+    assert list(result[MSISDN]) == [1.0, 3.0]
+    assert result.attrs['preprocessing'] == {'schema': 'engagement', 'group_by': None}
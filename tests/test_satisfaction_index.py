@@ -0,0 +1,127 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import satisfaction_index
+from satisfaction_index import SCORE_COLUMNS, SatisfactionIndex, build_satisfaction_index, make_server
+
+MSISDN = 'MSISDN/Number'
+
+
+def make_scores(msisdns, offset=0.0):
+    msisdns = np.asarray(msisdns, dtype=np.float64)
+    return pd.DataFrame({
+        MSISDN: msisdns,
+        'engagement_score': np.arange(len(msisdns), dtype=np.float64) + offset,
+        'experience_score': np.arange(len(msisdns), dtype=np.float64) * 2 + offset,
+        'satisfaction_score': np.arange(len(msisdns), dtype=np.float64) * 3 + offset,
+    })
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    # Unsorted input with a NULL MSISDN that must not be indexed
+    build_satisfaction_index(make_scores([33_600_000_003, 33_600_000_001, np.nan, 33_600_000_002]), str(tmp_path))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def server(index_dir, monkeypatch):
+    monkeypatch.setattr(satisfaction_index, 'RELOAD_CHECK_SECONDS', 0.0)
+    server = make_server(index_dir, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def request(url, body=None):
+    data = None if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode('utf-8'))
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data)) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_lookup_returns_scores_of_the_right_subscriber(index_dir):
+    index = SatisfactionIndex(index_dir)
+    assert len(index) == 3
+    assert index.lookup(33_600_000_001) == {'engagement_score': 1.0, 'experience_score': 2.0, 'satisfaction_score': 3.0}
+    assert index.lookup(33_600_000_000) is None
+    assert index.lookup(33_600_000_009) is None
+
+
+def test_lookup_many_marks_misses_with_nan(index_dir):
+    index = SatisfactionIndex(index_dir)
+    batch = index.lookup_many([33_600_000_002, 1, 33_600_000_003, 99_999_999_999])
+    np.testing.assert_array_equal(batch['found'], [True, False, True, False])
+    np.testing.assert_array_equal(batch['engagement_score'], [3.0, np.nan, 0.0, np.nan])
+    for column in SCORE_COLUMNS:
+        assert np.isnan(batch[column][[1, 3]]).all()
+
+
+def test_duplicate_msisdns_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match='Duplicate MSISDNs'):
+        build_satisfaction_index(make_scores([1, 2, 1]), str(tmp_path))
+
+
+def test_reload_picks_up_a_newly_published_version(index_dir, monkeypatch):
+    monkeypatch.setattr(satisfaction_index, 'RELOAD_CHECK_SECONDS', 0.0)
+    index = SatisfactionIndex(index_dir)
+    old_version = index.version
+    assert not index.reload_if_changed()
+
+    build_satisfaction_index(make_scores([33_600_000_001, 33_600_000_005], offset=10.0), index_dir)
+    assert index.reload_if_changed()
+    assert index.version != old_version
+    assert index.lookup(33_600_000_005)['engagement_score'] == 11.0
+    assert index.lookup(33_600_000_003) is None
+
+
+def test_http_single_and_batch_lookup(server):
+    status, payload = request(f'{server}/score?msisdn=33600000003')
+    assert status == 200 and payload['engagement_score'] == 0.0
+
+    status, payload = request(f'{server}/score?msisdn=33600000000')
+    assert status == 404
+
+    status, payload = request(f'{server}/scores', {'msisdns': [33_600_000_002, 5]})
+    assert status == 200
+    assert payload['results'][0]['satisfaction_score'] == 9.0
+    assert payload['results'][1] == {'msisdn': 5, 'error': 'unknown msisdn'}
+
+
+@pytest.mark.parametrize('query', ['', 'msisdn=abc', 'msisdn=1.5', 'msisdn=99999999999999999999', 'msisdn=1e400'])
+def test_http_get_rejects_invalid_msisdns(server, query):
+    status, _ = request(f'{server}/score?{query}')
+    assert status == 400
+
+
+@pytest.mark.parametrize('body', [
+    {'msisdns': 33_600_000_001},
+    {'msisdns': {'a': 1}},
+    {'msisdns': [1.5]},
+    {'msisdns': [True]},
+    {'msisdns': [2 ** 63]},
+    {'msisdns': ['abc']},
+    {'msisdns': [None]},
+    {'other': [1]},
+    b'{"msisdns": [1e400]}',
+    b'not json',
+])
+def test_http_post_rejects_invalid_bodies(server, body):
+    status, _ = request(f'{server}/scores', body)
+    assert status == 400
+
+
+def test_http_serves_a_rebuilt_index_without_restart(server, index_dir):
+    build_satisfaction_index(make_scores([33_600_000_007]), index_dir)
+    status, payload = request(f'{server}/score?msisdn=33600000007')
+    assert status == 200 and payload['msisdn'] == 33_600_000_007
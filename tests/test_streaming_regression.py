@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from streaming_regression import (accumulate_chunks, accumulate_partitions, chunk_stats, init_stats,
+                                  load_stats, merge_stats, save_stats, solve_regression)
+
+
+@pytest.fixture
+def regression_data():
+    rng = np.random.default_rng(0)
+    n = 500
+    # Wildly different feature scales, like session counts next to byte totals
+    X = rng.normal(size=(n, 4)) * np.array([1.0, 1e3, 1e9, 0.01]) + np.array([5.0, 1e4, 1e10, 0.0])
+    coef = np.array([2.0, -3e-3, 4e-9, 50.0])
+    y = X @ coef + 7.0 + rng.normal(scale=0.5, size=n)
+    return X, y
+
+
+def merged_stats(X, y, bounds=(0, 3, 120, 121, 400, 500)):
+    stats = init_stats(X.shape[1])
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        stats = merge_stats(stats, chunk_stats(X[start:end], y[start:end]))
+    return stats
+
+
+def test_merged_chunks_match_lstsq(regression_data):
+    X, y = regression_data
+    n, p = X.shape
+    model = solve_regression(merged_stats(X, y))
+
+    design = np.column_stack([np.ones(n), X])
+    beta, *_ = np.linalg.lstsq(design, y, rcond=None)
+    residuals = y - design @ beta
+    r2 = 1 - residuals @ residuals / ((y - y.mean()) @ (y - y.mean()))
+    sigma2 = residuals @ residuals / (n - p - 1)
+    std_err = np.sqrt(np.diag(sigma2 * np.linalg.inv(design.T @ design)))
+
+    np.testing.assert_allclose(model['coef'], beta[1:], rtol=1e-6)
+    assert model['intercept'] == pytest.approx(beta[0], rel=1e-6)
+    assert model['r2'] == pytest.approx(r2, rel=1e-9)
+    np.testing.assert_allclose(model['std_err'], std_err[1:], rtol=1e-5)
+
+
+def test_merge_is_independent_of_chunking(regression_data):
+    X, y = regression_data
+    whole = chunk_stats(X, y)
+    merged = merged_stats(X, y)
+    for key in ('mean_x', 'sxx', 'sxy'):
+        np.testing.assert_allclose(merged[key], whole[key], rtol=1e-9)
+    assert merged['n'] == whole['n']
+    assert merged['syy'] == pytest.approx(whole['syy'], rel=1e-9)
+
+
+def test_ridge_matches_standardized_closed_form(regression_data):
+    X, y = regression_data
+    alpha = 25.0
+    model = solve_regression(merged_stats(X, y), alpha=alpha, standardize=True)
+
+    scale = X.std(axis=0, ddof=1)
+    Z = (X - X.mean(axis=0)) / scale
+    beta = np.linalg.solve(Z.T @ Z + alpha * np.eye(X.shape[1]), Z.T @ (y - y.mean())) / scale
+
+    np.testing.assert_allclose(model['coef'], beta, rtol=1e-8)
+    assert model['intercept'] == pytest.approx(y.mean() - X.mean(axis=0) @ beta, rel=1e-8)
+    assert model['r2'] < solve_regression(merged_stats(X, y))['r2']
+
+
+def test_parallel_partitions_and_roundtrip(regression_data, tmp_path):
+    X, y = regression_data
+    columns = ['a', 'b', 'c', 'd']
+    frame = pd.DataFrame(X, columns=columns).assign(target=y)
+    partitions = [frame.iloc[:200], [frame.iloc[200:350], frame.iloc[350:]]]
+
+    serial = accumulate_chunks([frame], columns, 'target')
+    parallel = accumulate_partitions(partitions, columns, 'target', n_jobs=2)
+    np.testing.assert_allclose(parallel['sxx'], serial['sxx'], rtol=1e-9)
+
+    path = tmp_path / 'stats'
+    save_stats(serial, path)
+    restored = load_stats(path)
+    assert restored['n'] == serial['n']
+    np.testing.assert_allclose(restored['sxy'], serial['sxy'])
+
+
+def test_too_few_rows_raises():
+    with pytest.raises(ValueError):
+        solve_regression(chunk_stats(np.ones((1, 2)), np.ones(1)))
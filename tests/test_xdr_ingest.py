@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from xdr_ingest import (APP_COLUMNS, AVG_COLUMNS, HANDSET, MSISDN, RAW_COLUMNS, SUM_COLUMNS,
+                        _csv_units, _read_csv_range, ingest_xdr)
+
+
+@pytest.fixture
+def xdr_csv(tmp_path):
+    rng = np.random.default_rng(1)
+    n = 400
+    frame = pd.DataFrame({column: rng.random(n) * 1e4 for column in RAW_COLUMNS[2:]})
+    frame.insert(0, HANDSET, np.array(['Apple iPhone 6S', 'Samsung Galaxy S8', None], dtype=object)[rng.integers(0, 3, n)])
+    frame.insert(0, MSISDN, (33_600_000_000 + rng.integers(0, 40, n)).astype(np.float64))
+    # Sprinkle NULLs, including a NULL-MSISDN group that SQL GROUP BY keeps
+    frame.loc[rng.random(n) < 0.05, MSISDN] = np.nan
+    frame.loc[rng.random(n) < 0.1, "Avg RTT DL (ms)"] = np.nan
+    frame.loc[rng.random(n) < 0.1, "Youtube DL (Bytes)"] = np.nan
+    path = tmp_path / 'xdr.csv'
+    frame.to_csv(path, index=False)
+    return str(path), frame
+
+
+@pytest.mark.parametrize('block_size', [97, 1000, 10_000_000])
+def test_csv_ranges_cover_every_row_once(xdr_csv, block_size):
+    path, frame = xdr_csv
+    units = _csv_units(path, block_size)
+    parts = [_read_csv_range(path, header, start, end) for _, path, header, start, end in units]
+    combined = pd.concat([part for part in parts if not part.empty], ignore_index=True)
+    pd.testing.assert_frame_equal(combined[RAW_COLUMNS], frame[RAW_COLUMNS], check_dtype=False)
+
+
+def test_ingest_matches_pandas_groupby(xdr_csv):
+    path, frame = xdr_csv
+    views = ingest_xdr([path], n_workers=2, n_partitions=3, block_size=2048)
+
+    grouped = frame.groupby(MSISDN, dropna=False)
+    expected = pd.DataFrame({'session_count': grouped.size()})
+    for column, name in SUM_COLUMNS.items():
+        expected[name] = grouped[column].sum(min_count=1)
+    for column, name in AVG_COLUMNS.items():
+        expected[name] = grouped[column].mean()
+
+    engagement = views['engagement'].set_index(MSISDN).sort_index()
+    pd.testing.assert_frame_equal(
+        engagement, expected[['session_count', 'total_duration', 'total_download', 'total_upload']].sort_index(),
+        check_dtype=False, check_like=True)
+
+    aggregated = views['aggregated_users'].set_index(MSISDN).sort_index()
+    pd.testing.assert_frame_equal(aggregated[APP_COLUMNS], expected[APP_COLUMNS].sort_index(), check_dtype=False)
+
+    satisfaction = views['satisfaction'].set_index(MSISDN).sort_index()
+    assert satisfaction.index.notna().all()
+    np.testing.assert_allclose(satisfaction['avg_rtt_dl'],
+                               expected.loc[expected.index.notna(), 'avg_rtt_dl'].sort_index())
+
+    experience = views['experience'].set_index([MSISDN, 'handset_type']).sort_index()
+    expected_experience = frame.groupby([MSISDN, HANDSET], dropna=False)["Avg RTT DL (ms)"].mean()
+    expected_experience.index.names = [MSISDN, 'handset_type']
+    np.testing.assert_allclose(experience['avg_rtt_dl'], expected_experience.sort_index())